@@ -0,0 +1,77 @@
+"""latency of repeated chart calls with and without chart/aggregation cache
+
+    $ python benchmarks/bench_cache.py --rows 1000000 --repeat 10
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import pandasecharts
+from pandasecharts import echart  # noqa: F401
+
+
+def _timeit(build, repeat):
+    used = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        build(i)
+        used.append(time.perf_counter() - start)
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "x": rng.integers(0, 1000, args.rows),
+        "y": rng.random(args.rows),
+        "g": rng.choice(list("abcd"), args.rows),
+        "unused": rng.random(args.rows),
+    })
+    charts = {
+        "bar": lambda i: df.echart.bar("x", ["y"], agg_func="sum"),
+        "bar by": lambda i: df.echart.bar("x", ["y"], agg_func="sum", by="g"),
+        "line": lambda i: df.echart.line("x", ["y"], agg_func="mean"),
+    }
+    for name, build in charts.items():
+        pandasecharts.set_options("cache_size", 0)
+        cold = _timeit(build, args.repeat)
+        pandasecharts.set_options("cache_size", 16)
+        pandasecharts.clear_cache()
+        warm = _timeit(build, args.repeat)
+        print(f"{name:>8} no cache: {np.median(cold) * 1000:9.2f} ms, "
+              f"cache miss: {warm[0] * 1000:9.2f} ms, "
+              f"cache hit: {np.median(warm[1:]) * 1000:9.2f} ms")
+    print(pandasecharts.cache_info())
+
+    # 只修改标题，聚合结果可以复用
+    pandasecharts.set_options("cache_size", 0)
+    restyles = {
+        "line median": lambda i: df.echart.line("x", ["y"], xtype="value",
+                                                agg_func="median",
+                                                title=str(i)),
+        "line by": lambda i: df.echart.line("x", ["y"], xtype="value",
+                                            agg_func="mean", by="g",
+                                            title=str(i)),
+    }
+    for name, build in restyles.items():
+        for size in (0, 16):
+            pandasecharts.set_options("agg_cache_size", size)
+            pandasecharts.clear_cache()
+            used = _timeit(build, args.repeat)
+            print(f"{name:>12} agg_cache_size={size:<3}: first "
+                  f"{used[0] * 1000:9.2f} ms, restyle "
+                  f"{np.median(used[1:]) * 1000:9.2f} ms")
+    print(pandasecharts.cache_info("agg"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""time of binning a numeric series for `series.echart.bar()`
+
+compares `data_tool.count_values`, which counts the bins directly, with
+the former list based implementation and its numpy rewrite, both of
+which label every row with its bin and are kept below for reference.
+
+    $ python benchmarks/bench_categorize.py --rows 20000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pandasecharts.configs.basic_cfg import options
+from pandasecharts.core.data_tool import count_values
+from pandasecharts.core.data_tool import _as_float_array
+from pandasecharts.core.data_tool import _freedman_diaconis_bins
+from pandasecharts.core.data_tool import _histogram_bin_edges
+
+
+def _categorize_array_legacy(a, bins=None):
+    a = np.asarray(a)
+    if bins is not None:
+        if len(a) < bins:
+            return a
+    if bins is None:
+        bins = min(_freedman_diaconis_bins(a), options.get("max_bins"))
+    _, bin_edges = np.histogram(a, bins)
+    cat_a = np.digitize(a, bins=bin_edges)
+    cat2region = dict(
+        zip(range(1, bins+1), zip(bin_edges[:-1], bin_edges[1:])))
+    region_a = [cat2region[min(c, bins)][0] for c in cat_a]
+    return region_a
+
+
+def _categorize_array(a, bins=None):
+    """map every value of `a` to the left edge of its histogram bin
+
+    works on the whole ndarray with numpy, NaN (and NaT) stay NaN.
+    """
+    a = np.asarray(a)
+    if bins is not None:
+        if len(a) < bins:
+            return a
+    a = _as_float_array(a)
+    valid = ~np.isnan(a)
+    bin_edges = _histogram_bin_edges(a[valid], bins)
+    bins = len(bin_edges) - 1
+    # 等价于np.digitize，落在最右侧边界上的值归入最后一个区间
+    cat_a = np.searchsorted(bin_edges, a, side="right")
+    cat_a = np.clip(cat_a, 1, bins) - 1
+    region_a = bin_edges[cat_a]
+    region_a[~valid] = np.nan
+    return region_a
+
+
+def _count_labels(labels):
+    counts = pd.Series(labels).value_counts().sort_index()
+    return counts.index.values, counts.values
+
+
+def _timeit(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--bins", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    a = np.random.default_rng(0).normal(size=args.rows)
+
+    # 旧实现需要python list作为输入
+    legacy, expected = _timeit(
+        lambda: _count_labels(
+            _categorize_array_legacy(a.tolist(), bins=args.bins)),
+        args.repeat)
+    per_row, labeled = _timeit(
+        lambda: _count_labels(_categorize_array(a, bins=args.bins)),
+        args.repeat)
+    current, result = _timeit(
+        lambda: count_values(a, "value", bins=args.bins), args.repeat)
+    for labels, counts in (labeled, result):
+        assert np.allclose(expected[0], labels)
+        assert np.array_equal(expected[1], counts)
+
+    print(f"rows {args.rows}: legacy {legacy:.3f}s, "
+          f"per row numpy {per_row:.3f}s, count_values {current:.3f}s, "
+          f"speedup {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
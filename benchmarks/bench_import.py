@@ -0,0 +1,63 @@
+"""import time of pandasecharts modules, measured by `python -X importtime`
+
+    $ python benchmarks/bench_import.py --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+MODULES = [
+    "pandasecharts",
+    "pandasecharts.echart",
+    "pandasecharts.stream",
+]
+
+
+def _import_time(statement, root):
+    """cumulative import time in ms of every module imported by statement"""
+    env = dict(os.environ, PYTHONPATH=root)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             statement],
+                            env=env, capture_output=True, text=True,
+                            check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for module in MODULES:
+        runs = [_import_time(f"import {module}", root)
+                for _ in range(args.repeat)]
+        best = min(run[module] for run in runs)
+        loaded = runs[0]
+        pyecharts_loaded = any(name.split(".")[0] == "pyecharts"
+                               for name in loaded)
+        print(f"{module:>22}: {best:8.1f} ms, pandas loaded: "
+              f"{'pandas' in loaded}, pyecharts loaded: {pyecharts_loaded}")
+
+    # 第一次画图时才导入pyecharts
+    statement = ("import pandas as pd; from pandasecharts import echart; "
+                 "pd.DataFrame({'x': [1], 'y': [1]}).echart.bar('x', ['y'])")
+    runs = [_import_time(statement, root) for _ in range(args.repeat)]
+    # pyecharts的子模块可能先于pyecharts本身出现，取其中最大的累计时间
+    best = min(max((t for name, t in run.items()
+                    if name.split(".")[0] == "pyecharts"), default=0)
+               for run in runs)
+    print(f"{'pyecharts on first use':>22}: {best:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
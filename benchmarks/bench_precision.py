@@ -0,0 +1,59 @@
+"""rendered payload size of charts with different float precision
+
+    $ python benchmarks/bench_precision.py --rows 200000
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pandasecharts import echart  # noqa: F401
+
+
+def _payload(chart):
+    start = time.perf_counter()
+    size = len(chart.dump_options().encode("utf-8"))
+    return size, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--precisions", type=int, nargs="+",
+                        default=[6, 4, 2, 0])
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "x": np.arange(args.rows),
+        "y": rng.normal(size=args.rows) * 100,
+        "z": rng.random(args.rows),
+    })
+    charts = {
+        "line": lambda p: df.echart.line("x", ["y"], xtype="value",
+                                         precision=p),
+        "scatter": lambda p: df.echart.scatter("x", ["y", "z"],
+                                               precision=p),
+        "scatter3d": lambda p: df.echart.scatter3d("x", "y", "z",
+                                                   xtype="value",
+                                                   ytype="value",
+                                                   ztype="value",
+                                                   precision=p),
+    }
+    for name, build in charts.items():
+        full, full_time = _payload(build(None))
+        print(f"{name:>10} full precision: {full / 2**20:8.2f} MB "
+              f"({full_time:.2f}s)")
+        for precision in args.precisions:
+            size, used = _payload(build(precision))
+            print(f"{name:>10} precision={precision}: "
+                  f"{size / 2**20:8.2f} MB ({used:.2f}s), "
+                  f"saved {(full - size) / 2**20:8.2f} MB "
+                  f"({1 - size / full:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""peak memory of preparing a wide frame for `df.echart.bar`
+
+Every mode runs in a fresh interpreter. The peak RSS is reset after the
+frame is built (linux only), so the reported numbers only contain the
+work done by that mode.
+
+    $ python benchmarks/bench_projection.py --rows 2000000 --cols 80
+"""
+import argparse
+import subprocess
+import sys
+import tracemalloc
+import warnings
+
+
+MODES = {
+    # 之前每个方法开头的做法: 拷贝整个dataframe
+    "full_copy": """
+df_ = df.copy()
+df_ = df_.sort_values(by="x")
+df_["x"] = df_["x"].astype(str)
+""",
+    "projection": """
+df_ = select_columns(df, "x", ["c0", "c1"])
+df_ = df_.sort_values(by="x")
+df_["x"] = df_["x"].astype(str)
+""",
+    "bar": """
+df.echart.bar("x", ["c0", "c1"], agg_func="sum")
+""",
+}
+
+
+def _read_status(key):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(key):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def run_mode(mode, rows, cols):
+    import numpy as np
+    import pandas as pd
+    import pandasecharts.echart  # noqa: F401
+    from pandasecharts.core.data_tool import select_columns
+
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((rows, cols)),
+                      columns=[f"c{i}" for i in range(cols)])
+    df["x"] = rng.integers(0, 20, rows)
+
+    _reset_peak_rss()
+    rss = _read_status("VmRSS")
+    tracemalloc.start()
+    exec(MODES[mode], {"df": df, "select_columns": select_columns})
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak = _read_status("VmHWM")
+    print(f"{mode:>12}: frame {rss:9.1f} MB, peak rss {peak:9.1f} MB, "
+          f"extra rss {peak - rss:9.1f} MB, "
+          f"traced peak {traced_peak / 2**20:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=80)
+    parser.add_argument("--mode", choices=list(MODES), default=None)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        run_mode(args.mode, args.rows, args.cols)
+        return
+
+    for mode in MODES:
+        subprocess.run([sys.executable, __file__, "--mode", mode,
+                        "--rows", str(args.rows), "--cols", str(args.cols)],
+                       check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""benchmark every accessor method over synthetic data of different shapes
+
+each method is run on a base dataset, then one dimension at a time is
+swept: number of rows, distinct x values, number of ys, and `by` /
+`timeline` cardinality. For every case, wall time of building the chart,
+peak memory while building (tracemalloc), time of rendering and rendered
+payload bytes are saved to a JSON file, which can be compared with the
+results of another commit.
+
+    $ python benchmarks/bench_suite.py --output before.json
+    $ git checkout other-branch
+    $ python benchmarks/bench_suite.py --output after.json --compare before.json
+    $ python benchmarks/bench_suite.py --methods bar line --rows 1e3 1e7
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pandasecharts import echart  # noqa: F401
+
+
+PROVINCES = [
+    "北京", "天津", "河北", "山西", "内蒙古", "辽宁", "吉林", "黑龙江",
+    "上海", "江苏", "浙江", "安徽", "福建", "江西", "山东", "河南",
+    "湖北", "湖南", "广东", "广西", "海南", "重庆", "四川", "贵州",
+    "云南", "西藏", "陕西", "甘肃", "青海", "宁夏", "新疆",
+]
+
+
+def make_frame(rows, distinct, n_ys, by_groups, timeline_groups, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, distinct, rows)
+    df = pd.DataFrame({
+        "x": codes,
+        "cat": pd.Series(codes).map(lambda i: f"c{i}"),
+        "word": pd.Series(codes).map(lambda i: f"w{i}"),
+        "day": (pd.Timestamp("2020-01-01")
+                + pd.to_timedelta(codes, unit="D")).strftime("%Y-%m-%d"),
+        "prov": np.array(PROVINCES)[codes % len(PROVINCES)],
+        "z": rng.random(rows),
+        "g": rng.integers(0, max(by_groups or 1, 1), rows),
+        "t": rng.integers(0, max(timeline_groups or 1, 1), rows),
+    })
+    for i in range(n_ys):
+        df[f"y{i}"] = rng.random(rows) * 100
+    return df
+
+
+def _ys(p):
+    return [f"y{i}" for i in range(p["n_ys"])]
+
+
+def _groups(p):
+    return {"by": "g" if p["by"] else None,
+            "timeline": "t" if p["timeline"] else None}
+
+
+# (accessor, method): (build function, supported dimensions, raw points)
+# raw points为True的图表每行数据都会输出，行数太多时跳过
+CASES = {
+    ("df", "pie"): (
+        lambda df, p: df.echart.pie("cat", "y0", agg_func="sum",
+                                    **_groups(p)),
+        {"by", "timeline"}, False),
+    ("df", "bar"): (
+        lambda df, p: df.echart.bar("x", _ys(p), agg_func="sum",
+                                    **_groups(p)),
+        {"ys", "by", "timeline"}, False),
+    ("df", "bar3d"): (
+        lambda df, p: df.echart.bar3d("x", "prov", "y0",
+                                      by=_groups(p)["by"]),
+        {"by"}, True),
+    ("df", "line"): (
+        lambda df, p: df.echart.line("x", _ys(p), agg_func="mean",
+                                     **_groups(p)),
+        {"ys", "by", "timeline"}, False),
+    ("df", "line_raw"): (
+        lambda df, p: df.echart.line("z", _ys(p), xtype="value",
+                                     **_groups(p)),
+        {"ys", "by", "timeline"}, True),
+    ("df", "line3d"): (
+        lambda df, p: df.echart.line3d("x", "z", "y0", xtype="value",
+                                       ytype="value", ztype="value",
+                                       by=_groups(p)["by"]),
+        {"by"}, True),
+    ("df", "scatter"): (
+        lambda df, p: df.echart.scatter("z", _ys(p), **_groups(p)),
+        {"ys", "by", "timeline"}, True),
+    ("df", "scatter3d"): (
+        lambda df, p: df.echart.scatter3d("x", "z", "y0", xtype="value",
+                                          ytype="value", ztype="value",
+                                          by=_groups(p)["by"]),
+        {"by"}, True),
+    ("df", "boxplot"): (
+        lambda df, p: df.echart.boxplot(_ys(p), **_groups(p)),
+        {"ys", "by", "timeline"}, False),
+    ("df", "funnel"): (
+        lambda df, p: df.echart.funnel("cat", "y0", **_groups(p)),
+        {"by", "timeline"}, True),
+    ("df", "geo"): (
+        lambda df, p: df.echart.geo("prov", _ys(p), maptype="china",
+                                    agg_func="sum", **_groups(p)),
+        {"ys", "by", "timeline"}, False),
+    ("df", "map"): (
+        lambda df, p: df.echart.map("prov", "y0", maptype="china",
+                                    agg_func="sum", **_groups(p)),
+        {"by", "timeline"}, False),
+    ("df", "calendar"): (
+        lambda df, p: df.echart.calendar("day", "y0", agg_func="sum",
+                                         **_groups(p)),
+        {"by", "timeline"}, False),
+    ("df", "wordcloud"): (
+        lambda df, p: df.echart.wordcloud("word", "y0", agg_func="sum",
+                                          **_groups(p)),
+        {"by", "timeline"}, False),
+    ("series", "pie"): (
+        lambda df, p: df["cat"].echart.pie(), set(), False),
+    ("series", "bar"): (
+        lambda df, p: df["z"].echart.bar(), set(), False),
+    ("series", "bar_cat"): (
+        lambda df, p: df["cat"].echart.bar(), set(), False),
+    ("series", "line"): (
+        lambda df, p: df["z"].echart.line(), set(), False),
+    ("series", "boxplot"): (
+        lambda df, p: df["z"].echart.boxplot(), set(), False),
+    ("series", "geo"): (
+        lambda df, p: df["prov"].echart.geo("china"), set(), False),
+    ("series", "map"): (
+        lambda df, p: df["prov"].echart.map("china"), set(), False),
+}
+
+
+def _payload(chart):
+    start = time.perf_counter()
+    html = chart.render_embed()
+    return len(html.encode("utf-8")), time.perf_counter() - start
+
+
+def run_case(build, df, params, repeat):
+    """build the chart `repeat` times, then measure memory and payload"""
+    # 预热一次，排除第一次导入pyecharts等开销
+    build(df, params)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chart = build(df, params)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    build(df, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    payload, render_seconds = _payload(chart)
+    return {
+        "seconds": min(times),
+        "peak_bytes": peak,
+        "render_seconds": render_seconds,
+        "payload_bytes": payload,
+    }
+
+
+def _case_key(accessor, method, params):
+    dims = ",".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"{accessor}.{method}[{dims}]"
+
+
+def iter_params(args, dimensions):
+    """one-factor-at-a-time sweep around the base parameters"""
+    base = {"rows": args.base_rows, "distinct": args.base_distinct,
+            "n_ys": 1, "by": 0, "timeline": 0}
+    seen = set()
+    sweeps = [("rows", args.rows), ("distinct", args.distinct)]
+    if "ys" in dimensions:
+        sweeps.append(("n_ys", args.ys))
+    if "by" in dimensions:
+        sweeps.append(("by", args.groups))
+    if "timeline" in dimensions:
+        sweeps.append(("timeline", args.groups))
+    for name, values in [("base", [None])] + sweeps:
+        for value in values:
+            params = dict(base)
+            if value is not None:
+                params[name] = int(value)
+            key = tuple(sorted(params.items()))
+            if key not in seen:
+                seen.add(key)
+                yield params
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["key"]: r for r in json.load(f)["results"]}
+    print(f"\n{'case':<70} {'time':>8} {'memory':>8} {'payload':>8}")
+    for result in results:
+        old = baseline.get(result["key"])
+        if old is None or "error" in old or "error" in result:
+            continue
+        ratios = [result[k] / old[k] if old[k] else float("nan")
+                  for k in ("seconds", "peak_bytes", "payload_bytes")]
+        print(f"{result['key']:<70} " +
+              " ".join(f"{r:7.2f}x" for r in ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[1:]))
+    parser.add_argument("--methods", nargs="+", default=None,
+                        help="method names, e.g. bar, or accessor.method, "
+                             "e.g. series.pie")
+    parser.add_argument("--rows", type=float, nargs="+",
+                        default=[1e3, 1e4, 1e5, 1e6])
+    parser.add_argument("--distinct", type=float, nargs="+",
+                        default=[10, 100, 1000, 10000])
+    parser.add_argument("--ys", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--groups", type=int, nargs="+",
+                        default=[2, 10, 100])
+    parser.add_argument("--base-rows", type=int, default=10_000)
+    parser.add_argument("--base-distinct", type=int, default=100)
+    parser.add_argument("--raw-max-rows", type=float, default=1e6,
+                        help="skip charts drawing every row above this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", default=None,
+                        help="JSON results of another run to compare with")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    cases = CASES
+    if args.methods:
+        cases = {key: case for key, case in CASES.items()
+                 if key[1] in args.methods or ".".join(key) in args.methods}
+
+    frames = {}
+    results = []
+    for (accessor, method), (build, dimensions, raw) in cases.items():
+        for params in iter_params(args, dimensions):
+            key = _case_key(accessor, method, params)
+            result = {"key": key, "accessor": accessor, "method": method,
+                      **params}
+            if raw and params["rows"] > args.raw_max_rows:
+                result["error"] = "skipped: too many raw points"
+                results.append(result)
+                continue
+            frame_key = (params["rows"], params["distinct"], params["n_ys"],
+                         params["by"], params["timeline"])
+            if frame_key not in frames:
+                # 只保留最近的一个数据集，避免占用太多内存
+                frames = {frame_key: make_frame(*frame_key)}
+            try:
+                result.update(run_case(build, frames[frame_key], params,
+                                       args.repeat))
+                print(f"{key:<70} {result['seconds'] * 1000:10.1f} ms "
+                      f"{result['peak_bytes'] / 2**20:9.1f} MB "
+                      f"{result['payload_bytes'] / 2**10:10.1f} KB")
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+                print(f"{key:<70} {result['error']}")
+            results.append(result)
+
+    output = {
+        "meta": {
+            "commit": _git_commit(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "pyecharts": __import__("pyecharts").__version__,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=1)
+    print(f"results saved to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
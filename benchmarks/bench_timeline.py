@@ -0,0 +1,47 @@
+"""build time and payload of a bar race timeline, one frame per day
+
+    $ python benchmarks/bench_timeline.py --frames 365 --bars 30
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pandasecharts import echart  # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=365)
+    parser.add_argument("--bars", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=args.frames)
+    names = [f"team{i}" for i in range(args.bars)]
+    df = pd.DataFrame({
+        "day": np.repeat(days.strftime("%Y-%m-%d"), args.bars),
+        "name": np.tile(names, args.frames),
+        "value": rng.random(args.frames * args.bars).cumsum(),
+    })
+
+    used = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        tl = df.echart.bar("name", ["value"], timeline="day",
+                           reverse_axis=True, label_show=True)
+        used.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    payload = tl.dump_options()
+    dump_time = time.perf_counter() - start
+    print(f"{args.frames} frames x {args.bars} bars: "
+          f"build {min(used) * 1000:.1f} ms, dump {dump_time * 1000:.1f} ms, "
+          f"payload {len(payload.encode('utf-8')) / 2**10:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,26 @@
+import importlib
 from .configs.basic_cfg import options, set_options, get_options
 
 __version__ = "0.5"
 
-__all__ = ["options", "set_options", "get_options"]
+__all__ = ["options", "set_options", "get_options",
+           "cache_info", "clear_cache", "render_many",
+           "profile", "add_profile_callback", "remove_profile_callback"]
+
+
+# 以下函数依赖pandas和pyecharts，在第一次使用时才导入
+_LAZY_ATTRS = {
+    "cache_info": ".core.cache_tool",
+    "clear_cache": ".core.cache_tool",
+    "render_many": ".core.render_tool",
+    "profile": ".core.profile_tool",
+    "add_profile_callback": ".core.profile_tool",
+    "remove_profile_callback": ".core.profile_tool",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
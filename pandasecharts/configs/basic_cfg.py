@@ -4,6 +4,21 @@ options = {}
 
 
 options["max_bins"] = 50
+options["downsample_points"] = 2000
+# 推断列的类型时最多抽样检查的行数，None表示检查所有行
+options["infer_sample_size"] = 10000
+# 图表数据中浮点数保留的小数位数，None表示全精度
+options["precision"] = None
+# 构建by和timeline分组图表的进程数，-1表示使用所有cpu
+options["n_jobs"] = 1
+# 缓存图表的最大个数，0表示不缓存
+options["cache_size"] = 0
+# 缓存图表估计占用的最大字节数，None表示不限制
+options["cache_bytes"] = None
+# 缓存聚合结果的最大个数，0表示不缓存
+options["agg_cache_size"] = 0
+# 缓存聚合结果占用的最大字节数，None表示不限制
+options["agg_cache_bytes"] = None
 
 
 def set_options(key, value):
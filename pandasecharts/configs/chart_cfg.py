@@ -1,4 +1,11 @@
-import pyecharts.options as opts
+from ..core.import_tool import lazy_import
+
+
+opts = lazy_import("pyecharts.options")
+
+# 日历图距离顶部的位置，以及多个日历时每个日历占用的高度，单位为px
+CALENDAR_TOP = 60
+CALENDAR_HEIGHT = 180
 
 
 class ChartConfig:
@@ -111,7 +118,8 @@ class BarConfig(ChartConfig):
         position = "right" if position else "top"
         return super().get_label_opts(label_opts, label_show, position)
 
-    def get_xaxis_opts(self, xaxis_opts, xaxis_name, multiple_yaxis):
+    def get_xaxis_opts(self, xaxis_opts, xaxis_name, multiple_yaxis,
+                       xtype="category"):
         if xaxis_opts is None:
             xaxis_opts = {}
         xaxis_opts_ = {}
@@ -121,7 +129,7 @@ class BarConfig(ChartConfig):
                                                          type_="shadow"),
             }
         xaxis_opts_.update(xaxis_opts)
-        return self.get_axis_opts(xaxis_opts_, xaxis_name, "category")
+        return self.get_axis_opts(xaxis_opts_, xaxis_name, xtype)
 
     def get_yaxis_opts(self, yaxis_opts, yaxis_name):
         return self.get_axis_opts(yaxis_opts, yaxis_name, "value")
@@ -232,14 +240,34 @@ class CalendarConfig(ChartConfig):
         return super().get_visualmap_opts(visualmap_opts_, min_, max_)
 
     def get_calendar_opts(self, calendar_opts, min_date, max_date):
+        """one calendar for every year between `min_date` and `max_date`
+
+        dates are "%Y-%m-%d" strings, calendars of different years are
+        placed one below another. If `range_` is given in `calendar_opts`,
+        only one calendar is used.
+        """
         if calendar_opts is None:
             calendar_opts = {}
-
-        calendar_opts_ = {
-            "range_": [min_date, max_date]
-        }
-        calendar_opts_.update(calendar_opts)
-        return calendar_opts_
+        if "range_" in calendar_opts or min_date is None:
+            calendar_opts_ = {"range_": [min_date, max_date]}
+            calendar_opts_.update(calendar_opts)
+            return [calendar_opts_]
+
+        min_year, max_year = int(min_date[:4]), int(max_date[:4])
+        calendar_opts_list = []
+        for year in range(min_year, max_year + 1):
+            calendar_opts_ = {
+                "range_": [max(min_date, f"{year}-01-01"),
+                           min(max_date, f"{year}-12-31")]
+            }
+            # 多个日历时，每年的日历依次往下排列
+            if max_year > min_year:
+                calendar_opts_["pos_top"] = (
+                    CALENDAR_TOP + (year - min_year) * CALENDAR_HEIGHT
+                )
+            calendar_opts_.update(calendar_opts)
+            calendar_opts_list.append(calendar_opts_)
+        return calendar_opts_list
 
 
 class WordCloudConfig(ChartConfig):
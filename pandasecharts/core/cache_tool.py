@@ -0,0 +1,341 @@
+import sys
+import copy
+import uuid
+import hashlib
+import inspect
+import functools
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import simplejson
+from simplejson import RawJSON
+from ..configs.basic_cfg import options
+from .data_tool import select_columns, aggregate, convert_columns
+from .stats_tool import column_digest
+
+
+# 这些参数的值是列名，缓存的key只对这些列计算指纹
+_COLUMN_ARGS = ("x", "y", "z", "ys", "sort", "by", "timeline")
+
+
+class LRUCache:
+    """LRU cache of built charts or aggregated dataframes
+
+    entries are evicted from the least recently used one, when there are
+    more than `max_size` entries or their estimated size is more than
+    `max_bytes`.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, chart, max_size, max_bytes=None):
+        nbytes = _estimate_nbytes(chart)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        # 单个图表超过上限时不缓存，但仍然按新的上限淘汰旧的图表
+        if max_bytes is None or nbytes <= max_bytes:
+            self._entries[key] = (chart, nbytes)
+            self.nbytes += nbytes
+        while (len(self._entries) > max_size
+               or (max_bytes is not None and self.nbytes > max_bytes)):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "nbytes": self.nbytes,
+        }
+
+
+chart_cache = LRUCache()
+agg_cache = LRUCache()
+_CACHES = {"chart": chart_cache, "agg": agg_cache}
+# 不影响图表结果的options和参数，不参与缓存的key
+_IGNORED_OPTIONS = ("cache_size", "cache_bytes",
+                    "agg_cache_size", "agg_cache_bytes", "n_jobs")
+
+
+def _estimate_nbytes(obj):
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            total += int(item.memory_usage(deep=True).sum())
+        elif isinstance(item, RawJSON):
+            total += len(item.encoded_json)
+        elif isinstance(item, dict):
+            total += sys.getsizeof(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            total += sys.getsizeof(item)
+            stack.extend(item)
+        elif isinstance(item, np.ndarray):
+            total += item.nbytes
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+        else:
+            total += sys.getsizeof(item)
+    return total
+
+
+def _normalize(value):
+    """turn an argument into a hashable value, raise TypeError if can't"""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted(((str(k), _normalize(v))
+                                      for k, v in value.items()),
+                                     key=lambda item: item[0])))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_normalize(v) for v in value))
+    if isinstance(value, np.generic):
+        return value.item()
+    if callable(value):
+        # 函数只按对象本身区分，例如agg_func为lambda时
+        hash(value)
+        return value
+    if (hasattr(value, "__dict__")
+            and not isinstance(value, (pd.Series, pd.DataFrame))):
+        # pyecharts的opts和JsCode等对象
+        return (type(value).__qualname__, _normalize(vars(value)))
+    hash(value)
+    return value
+
+
+def _fingerprint(data, column_stats=None):
+    """hash of the dtypes and values of the columns of `data`
+
+    `column_stats(col)` returns the `ColumnStats` of a column of the
+    accessor's data, whose digest is computed once and reused until the
+    column is modified, instead of hashing every column on every lookup.
+    """
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    digest = hashlib.sha1(usedforsecurity=False)
+    digest.update(repr([(str(col), str(dtype))
+                        for col, dtype in frame.dtypes.items()]).encode())
+    if not frame.columns.is_unique:
+        column_stats = None
+    for i, col in enumerate(frame.columns):
+        if column_stats is not None:
+            digest.update(column_stats(col).digest)
+        else:
+            digest.update(column_digest(frame.iloc[:, i]))
+    return digest.hexdigest()
+
+
+def _accessor_stats(accessor):
+    if isinstance(accessor._obj, pd.Series):
+        return lambda col: accessor._column_stats()
+    return accessor._stats.__getitem__
+
+
+def _freeze(obj):
+    """dump data lists of chart options into `RawJSON`
+
+    the frozen chart is deep copied cheaply on every cache hit. Returns a
+    memo for `copy.deepcopy`, which shares `_xaxis_data` of pyecharts
+    charts, a list pyecharts only reads after `add_xaxis`.
+    """
+    from pyecharts.charts.base import default
+
+    memo = {}
+    seen = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key == "_xaxis_data":
+                    memo[id(value)] = value
+                elif key in ("data", "source") and isinstance(value, list):
+                    try:
+                        item[key] = RawJSON(simplejson.dumps(
+                            value, default=default, ignore_nan=True))
+                    except TypeError:
+                        # 包含pyecharts的opts等对象时保持不变
+                        stack.append(value)
+                else:
+                    stack.append(value)
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif (hasattr(item, "__dict__") and not isinstance(item, type)
+              and not isinstance(item, (RawJSON, pd.Series, pd.DataFrame))):
+            stack.append(vars(item))
+    return memo
+
+
+def _renew_chart_ids(chart):
+    # 同一个缓存图表的副本可能渲染在同一页面中，每个副本需要不同的DOM id
+    if hasattr(chart, "chart_id"):
+        chart.chart_id = uuid.uuid4().hex
+    for child in getattr(chart, "_charts", ()):
+        _renew_chart_ids(child)
+    return chart
+
+
+def _make_key(obj, name, signature, args, kwargs, column_stats=None):
+    bound = signature.bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop(next(iter(signature.parameters)))
+    arguments.pop("n_jobs", None)
+
+    if isinstance(obj, pd.DataFrame):
+        columns = [arguments.get(arg) for arg in _COLUMN_ARGS]
+        data = select_columns(obj, *columns)
+    else:
+        data = obj
+    # 全局options也会影响图表的结果
+    chart_options = {k: v for k, v in options.items()
+                     if k not in _IGNORED_OPTIONS}
+    return (name,
+            _fingerprint(data, column_stats),
+            _normalize(arguments),
+            _normalize(chart_options))
+
+
+def cached(method):
+    """cache charts built by an accessor method
+
+    only works when `options["cache_size"]` is larger than 0. The key of
+    cache is made from a fingerprint of the referenced columns, call
+    arguments and `options`, so a chart is rebuilt once the data changes.
+    calls whose arguments can't be hashed, or whose columns can't be
+    hashed by `pd.util.hash_pandas_object`, are not cached.
+
+    every call returns a copy of the cached chart with a new `chart_id`,
+    so changing the returned chart, e.g. by `set_global_opts`, doesn't
+    change the cache.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        max_size = options.get("cache_size")
+        if not max_size:
+            return method(self, *args, **kwargs)
+        try:
+            key = _make_key(self._obj, method.__qualname__, signature,
+                            args, kwargs, _accessor_stats(self))
+        except (TypeError, KeyError, ValueError):
+            return method(self, *args, **kwargs)
+
+        entry = chart_cache.get(key)
+        if entry is None:
+            chart = method(self, *args, **kwargs)
+            memo = _freeze(chart)
+            chart_cache.put(key, (chart, memo), max_size,
+                            options.get("cache_bytes"))
+        else:
+            chart, memo = entry
+        return _renew_chart_ids(copy.deepcopy(chart, dict(memo)))
+
+    return wrapper
+
+
+def cached_aggregate(df, x, ys, agg_func, by=None, timeline=None,
+                     resample=None, convert=None, column_stats=None):
+    """same as `aggregate`, memoized when `options["agg_cache_size"]` > 0
+
+    the key is made from a fingerprint of the grouped and aggregated
+    columns, so restyling a chart, e.g. changing title, theme or figsize,
+    reuses the aggregated dataframe instead of grouping the frame again.
+    On a hit, neither `convert` nor the aggregation runs.
+
+    Args:
+    ---
+        convert: dict, optional. Defaults to None
+            conversions applied before aggregating, see
+            `data_tool.convert_columns`, e.g. {x: "category"}.
+        column_stats: callable, optional. Defaults to None
+            `column_stats(col)` returns the `ColumnStats` of a column of
+            the accessor's data, whose digest is reused for the key.
+            `df` must hold these columns unconverted.
+    """
+    def compute():
+        data = df
+        if convert:
+            data = convert_columns(select_columns(df, x, ys, by, timeline),
+                                   convert, column_stats)
+        return aggregate(data, x, ys, agg_func, by, timeline, resample)
+
+    max_size = options.get("agg_cache_size")
+    if not max_size:
+        return compute()
+    try:
+        data = select_columns(df, x, ys, by, timeline)
+        key = (_fingerprint(data, column_stats),
+               _normalize([x, ys, agg_func, by, timeline, resample,
+                           convert]))
+    except (TypeError, KeyError, ValueError):
+        return compute()
+
+    result = agg_cache.get(key)
+    if result is None:
+        result = compute()
+        agg_cache.put(key, result, max_size, options.get("agg_cache_bytes"))
+    # 调用者可能会修改返回的dataframe，返回一个浅拷贝
+    return result.copy(deep=False)
+
+
+def cache_info(name="chart"):
+    """statistics of a cache
+
+    Args:
+    ---
+        name: str, optional. Defaults to "chart"
+            "chart" for built charts, "agg" for aggregated dataframes.
+
+    Returns:
+    ---
+        dict: number of hits, misses, evictions, entries (size) and
+            estimated bytes of cached objects (nbytes).
+    """
+    return _CACHES[name].info()
+
+
+def clear_cache(name=None):
+    """remove cached objects and reset the statistics
+
+    Args:
+    ---
+        name: str, optional. Defaults to None
+            "chart" or "agg", If None, clear all caches.
+    """
+    names = list(_CACHES) if name is None else [name]
+    for name in names:
+        _CACHES[name].clear()
@@ -1,53 +1,189 @@
+import os
+import pickle
 import warnings
-import copy
-from pyecharts.charts import Page, Timeline
-from pyecharts.charts import Line, Bar, Pie, Scatter
-from pyecharts.charts import Line3D, Bar3D, Scatter3D
-from pyecharts.charts import Boxplot, Funnel, Geo, Map
-from pyecharts.charts import Calendar, WordCloud
-from pyecharts import options as opts
-
-
-def by_decorator(by=None):
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .import_tool import lazy_import
+from .data_tool import downsample as downsample_df, format_days
+from .json_tool import to_json_data
+from .profile_tool import timed, stage, group
+from .timeline_tool import factor_timeline
+from ..configs.basic_cfg import options
+
+
+charts = lazy_import("pyecharts.charts")
+opts = lazy_import("pyecharts.options")
+
+
+def iter_groups(df, key):
+    """yield `(value, sub dataframe)` for every group of column `key`
+
+    the column is factorized once, and rows are sorted by group once,
+    unless already sorted, e.g. by `data_tool.aggregate`, each group is
+    then a slice of the sorted frame instead of a copy taken from `df`.
+    if `key` is an index level, e.g. a `by` aggregated as one of the ys,
+    see `data_tool.aggregate`, groups are made of the index level.
+    """
+    if key in df.index.names:
+        for value, positions in df.groupby(level=key).indices.items():
+            yield value, df.take(positions).reset_index(level=key, drop=True)
+        return
+    codes, uniques = pd.factorize(df[key], sort=True)
+    if len(codes) and not np.all(codes[1:] >= codes[:-1]):
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        df = df.take(order)
+    # 缺失值的code为-1，排在最前面，和groupby一样丢弃
+    ends = np.searchsorted(codes, np.arange(len(uniques)), side="right")
+    start = np.searchsorted(codes, 0)
+    for value, end in zip(uniques, ends):
+        yield value, df.iloc[start:end]
+        start = end
+
+
+def _set_series_data(chart, data):
+    # pyecharts的add_yaxis会把x和y逐个配对，这里先添加空序列，
+    # 再直接放入序列化好的数据
+    chart.options["series"][-1]["data"] = data
+
+
+def _dataset_source(df, columns, precision):
+    # 列式的dataset，即{列名: 列数据}，所有序列共享同一份数据
+    return {str(col): to_json_data(df[col], precision) for col in columns}
+
+
+def _encode(x, y, use_dataset, reverse_axis=False):
+    if not use_dataset:
+        return None
+    if reverse_axis:
+        x, y = y, x
+    return {"x": str(x), "y": str(y)}
+
+
+def _measure_build(args, kwargs, chart):
+    df = kwargs["df"] if "df" in kwargs else args[0]
+    return {"rows": len(df)}
+
+
+def _call(func, kwargs):
+    return func(**kwargs)
+
+
+def _resolve_n_jobs(n_jobs):
+    if n_jobs is None:
+        n_jobs = options.get("n_jobs") or 1
+    if n_jobs < 0:
+        n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def _build_serially(func, kwargs_list, labels):
+    charts_ = []
+    for kwargs, label in zip(kwargs_list, labels):
+        with group(label):
+            charts_.append(func(**kwargs))
+    return charts_
+
+
+def map_charts(func, kwargs_list, n_jobs=None, labels=None):
+    """build a chart for every kwargs in `kwargs_list`, in order
+
+    if `n_jobs` > 1, charts are built in a process pool, only the kwargs,
+    i.e. the options and the sub dataframe of each group, are pickled to
+    the workers, and charts are returned in the same order as
+    `kwargs_list`. If `func` or the shared options can't be pickled, e.g.
+    a lambda inside them, charts are built one by one.
+
+    Args:
+    ---
+        func: callable
+            a module level chart function, e.g. `get_bar`.
+        kwargs_list: list of dict
+            arguments of `func` for every chart.
+        n_jobs: int, optional. Defaults to None
+            number of processes, -1 means using all cpus.
+            If None, same as `options["n_jobs"]`.
+        labels: list of str, optional. Defaults to None
+            group label of every chart, used by profiling.
+    """
+    if labels is None:
+        labels = [None] * len(kwargs_list)
+    n_jobs = min(_resolve_n_jobs(n_jobs), len(kwargs_list))
+    if n_jobs <= 1:
+        return _build_serially(func, kwargs_list, labels)
+
+    shared = {k: v for k, v in kwargs_list[0].items() if k != "df"}
+    try:
+        pickle.dumps((func, shared))
+    except Exception:
+        warnings.warn("arguments can't be pickled, build charts in "
+                      "a single process instead")
+        return _build_serially(func, kwargs_list, labels)
+
+    chunksize = max(len(kwargs_list) // (n_jobs * 4), 1)
+    # 子进程中的阶段无法记录，只记录整体的耗时
+    with stage("parallel_build", points=len(kwargs_list)), \
+            ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(_call, [func] * len(kwargs_list),
+                                 kwargs_list, chunksize=chunksize))
+
+
+def by_decorator(by=None, n_jobs=None):
     def wrapper(func):
+        if by is None:
+            return func
+
         def inner(**kwargs):
-            if by is not None:
-                page = Page(layout=Page.DraggablePageLayout)
-                for by_value, by_df in kwargs["df"].groupby(by):
-                    new_kwargs = copy.deepcopy(kwargs)
-                    new_kwargs["df"] = by_df
-                    new_kwargs["title_opts"]["subtitle"] += f"{by}={by_value}"
-                    chart_ = func(**new_kwargs)
-                    page.add(chart_)
-                return page
-            else:
-                return func(**kwargs)
+            page = charts.Page(layout=charts.Page.DraggablePageLayout)
+            kwargs_list = []
+            labels = []
+            for by_value, by_df in iter_groups(kwargs["df"], by):
+                # 除了df和title_opts，其余参数在各个分组间共享
+                new_kwargs = dict(kwargs, df=by_df)
+                new_kwargs["title_opts"] = dict(kwargs["title_opts"])
+                new_kwargs["title_opts"]["subtitle"] += f"{by}={by_value}"
+                kwargs_list.append(new_kwargs)
+                labels.append(f"{by}={by_value}")
+            for chart_ in map_charts(func, kwargs_list, n_jobs, labels):
+                page.add(chart_)
+            return page
         return inner
     return wrapper
 
 
-def timeline_decorator(timeline=None, timeline_opts=None, init_opts=None):
+def timeline_decorator(timeline=None, timeline_opts=None, init_opts=None,
+                       n_jobs=None, axis_order=None):
     if timeline_opts is None:
         timeline_opts = {}
 
     def wrapper(func):
+        if timeline is None:
+            return func
+
         def inner(**kwargs):
-            if timeline is not None:
-                tl = Timeline(init_opts=opts.InitOpts(**init_opts))
-                tl.add_schema(**timeline_opts)
-                for t, df_ in kwargs["df"].groupby(timeline):
-                    new_kwargs = copy.deepcopy(kwargs)
-                    new_kwargs["title_opts"]["title"] += f"{timeline}={t}"
-                    new_kwargs["df"] = df_
-                    chart_ = func(**new_kwargs)
-                    tl.add(chart_, f"{t}")
-                return tl
-            else:
-                return func(**kwargs)
+            tl = charts.Timeline(init_opts=opts.InitOpts(**init_opts))
+            tl.add_schema(**timeline_opts)
+            time_points = []
+            kwargs_list = []
+            for t, df_ in iter_groups(kwargs["df"], timeline):
+                new_kwargs = dict(kwargs, df=df_)
+                new_kwargs["title_opts"] = dict(kwargs["title_opts"])
+                new_kwargs["title_opts"]["title"] += f"{timeline}={t}"
+                time_points.append(t)
+                kwargs_list.append(new_kwargs)
+            labels = [f"{timeline}={t}" for t in time_points]
+            chart_list = map_charts(func, kwargs_list, n_jobs, labels)
+            for t, chart_ in zip(time_points, chart_list):
+                tl.add(chart_, f"{t}")
+            with stage("factor_timeline", points=len(chart_list)):
+                factor_timeline(tl, axis_order)
+            return tl
         return inner
     return wrapper
 
 
+@timed("build", _measure_build)
 def get_pie(df,
             x,
             y,
@@ -60,10 +196,10 @@ def get_pie(df,
     if agg_func is not None:
         df = df.groupby(x)[y].agg(agg_func).reset_index()
 
-    pie = Pie(init_opts=opts.InitOpts(**init_opts))
+    pie = charts.Pie(init_opts=opts.InitOpts(**init_opts))
     pie = (
         pie
-        .add(str(y), df[[x, y]].values.tolist(), **pie_opts)
+        .add(str(y), to_json_data(df[[x, y]], as_list=True), **pie_opts)
         .set_series_opts(
             label_opts=opts.LabelOpts(**label_opts)
         )
@@ -75,15 +211,19 @@ def get_pie(df,
     return pie
 
 
+@timed("build", _measure_build)
 def get_bar(df,
             x,
             ys,
+            xtype,
             yaxis_names,
             sort,
             agg_func,
             multiple_yaxis,
             stack_view,
             reverse_axis,
+            use_dataset,
+            precision,
             init_opts,
             label_opts,
             title_opts,
@@ -104,13 +244,28 @@ def get_bar(df,
         # 排序显示的顺序和是否反转坐标轴有关?
         df = df.sort_values(by=sort, ascending=reverse_axis)
 
-    bar = Bar(init_opts=opts.InitOpts(**init_opts))
-    bar = bar.add_xaxis(df[x].values.tolist())
+    bar = charts.Bar(init_opts=opts.InitOpts(**init_opts))
+    if use_dataset:
+        bar.add_dataset(source=_dataset_source(df, [x] + ys, precision))
+        # x轴的类目由dataset提供，这里只是为了reversal_axis能正常使用
+        bar.add_xaxis(None)
+        y_data = {y: [] for y in ys}
+    elif xtype == "time":
+        # 时间轴上每个点是[时间, 值]，反转坐标轴后时间在y轴上，变为[值, 时间]
+        bar.add_xaxis(None)
+        y_data = {y: to_json_data(df[[y, x] if reverse_axis else [x, y]],
+                                  precision)
+                  for y in ys}
+    else:
+        bar = bar.add_xaxis(to_json_data(df[x], precision))
+        y_data = {y: to_json_data(df[y], precision) for y in ys}
+
     if multiple_yaxis:
         for i, y in enumerate(ys):
             bar.add_yaxis(str(y),
-                          df[y].values.tolist(),
-                          yaxis_index=i)
+                          y_data[y],
+                          yaxis_index=i,
+                          encode=_encode(x, y, use_dataset, reverse_axis))
         for j in range(1, len(ys)):
             bar.extend_axis(
                 yaxis=opts.AxisOpts(name=yaxis_names[j],
@@ -118,12 +273,13 @@ def get_bar(df,
             )
     else:
         for y, st in zip(ys, stack):
-            bar.add_yaxis(str(y), df[y].values.tolist(), stack=st)
+            bar.add_yaxis(str(y), y_data[y], stack=st,
+                          encode=_encode(x, y, use_dataset, reverse_axis))
 
     bar.set_series_opts(
         label_opts=opts.LabelOpts(**label_opts),
     )
-    # bar的x轴只支持category，不支持value
+    # bar的x轴只支持category和time，不支持value
     if reverse_axis:
         bar.reversal_axis()
         bar.set_global_opts(
@@ -150,11 +306,13 @@ def get_bar(df,
     return bar
 
 
+@timed("build", _measure_build)
 def get_bar3d(df,
               x,
               y,
               z,
               visualmap,
+              precision,
               init_opts,
               title_opts,
               xaxis_opts,
@@ -162,10 +320,10 @@ def get_bar3d(df,
               zaxis_opts,
               visualmap_opts):
     bar3d = (
-        Bar3D(init_opts=opts.InitOpts(**init_opts))
+        charts.Bar3D(init_opts=opts.InitOpts(**init_opts))
         .add(
             "",
-            data=df[[x, y, z]].values.tolist(),
+            data=to_json_data(df[[x, y, z]], precision),
             xaxis3d_opts=opts.Axis3DOpts(**xaxis_opts),
             yaxis3d_opts=opts.Axis3DOpts(**yaxis_opts),
             zaxis3d_opts=opts.Axis3DOpts(**zaxis_opts),
@@ -184,13 +342,18 @@ def get_bar3d(df,
     return bar3d
 
 
+@timed("build", _measure_build)
 def get_line(df,
              x,
              ys,
              yaxis_names,
              multiple_yaxis,
              agg_func,
+             downsample,
+             downsample_points,
              smooth,
+             use_dataset,
+             precision,
              init_opts,
              label_opts,
              title_opts,
@@ -202,16 +365,22 @@ def get_line(df,
     # TODO: line的itemType
     if agg_func is not None:
         df = df.groupby(x)[ys].agg(agg_func).reset_index()
+    df = downsample_df(df, x, ys, downsample, downsample_points)
 
-    line = Line(init_opts=opts.InitOpts(**init_opts))
-    line = line.add_xaxis(df[x].values.tolist())
+    line = charts.Line(init_opts=opts.InitOpts(**init_opts))
+    if use_dataset:
+        line.add_dataset(source=_dataset_source(df, [x] + ys, precision))
 
     if multiple_yaxis:
         for i, y in enumerate(ys):
             line.add_yaxis(str(y),
-                           df[y].values.tolist(),
+                           [],
                            is_smooth=smooth,
-                           yaxis_index=i)
+                           xaxis_index=0,
+                           yaxis_index=i,
+                           encode=_encode(x, y, use_dataset))
+            if not use_dataset:
+                _set_series_data(line, to_json_data(df[[x, y]], precision))
         for j in range(1, len(ys)):
             line.extend_axis(
                 yaxis=opts.AxisOpts(name=yaxis_names[j],
@@ -220,8 +389,15 @@ def get_line(df,
     else:
         for y in ys:
             line.add_yaxis(str(y),
-                           df[y].values.tolist(),
-                           is_smooth=smooth)
+                           [],
+                           is_smooth=smooth,
+                           xaxis_index=0,
+                           encode=_encode(x, y, use_dataset))
+            if not use_dataset:
+                _set_series_data(line, to_json_data(df[[x, y]], precision))
+    # 时间轴的数据点已经是[时间, 值]，不需要再写一遍x轴的数据
+    if not use_dataset and xaxis_opts.get("type_") != "time":
+        line.add_xaxis(to_json_data(df[x], precision))
 
     line.set_series_opts(
         label_opts=opts.LabelOpts(**label_opts)
@@ -244,11 +420,13 @@ def get_line(df,
     return line
 
 
+@timed("build", _measure_build)
 def get_line3d(df,
                x,
                y,
                z,
                visualmap,
+               precision,
                init_opts,
                title_opts,
                xaxis_opts,
@@ -256,10 +434,10 @@ def get_line3d(df,
                zaxis_opts,
                visualmap_opts):
     line3d = (
-        Line3D(init_opts=opts.InitOpts(**init_opts))
+        charts.Line3D(init_opts=opts.InitOpts(**init_opts))
         .add(
             "",
-            data=df[[x, y, z]].values.tolist(),
+            data=to_json_data(df[[x, y, z]], precision),
             xaxis3d_opts=opts.Axis3DOpts(**xaxis_opts),
             yaxis3d_opts=opts.Axis3DOpts(**yaxis_opts),
             zaxis3d_opts=opts.Axis3DOpts(**zaxis_opts),
@@ -278,13 +456,18 @@ def get_line3d(df,
     return line3d
 
 
+@timed("build", _measure_build)
 def get_scatter(df,
                 x,
                 ys,
                 yaxis_names,
                 agg_func,
+                downsample,
+                downsample_points,
                 multiple_yaxis,
                 visualmap,
+                use_dataset,
+                precision,
                 init_opts,
                 label_opts,
                 title_opts,
@@ -295,15 +478,23 @@ def get_scatter(df,
                 datazoom_opts):
     if agg_func is not None:
         df = df.groupby(x)[ys].agg(agg_func).reset_index()
+    df = downsample_df(df, x, ys, downsample, downsample_points)
 
-    scatter = Scatter(init_opts=opts.InitOpts(**init_opts))
-    scatter.add_xaxis(df[x].values.tolist())
+    scatter = charts.Scatter(init_opts=opts.InitOpts(**init_opts))
+    if use_dataset:
+        scatter.add_dataset(source=_dataset_source(df, [x] + ys, precision))
+    else:
+        scatter.add_xaxis([])
 
     if multiple_yaxis:
         for i, y in enumerate(ys):
             scatter.add_yaxis(str(y),
-                              df[y].values.tolist(),
-                              yaxis_index=i)
+                              [],
+                              yaxis_index=i,
+                              encode=_encode(x, y, use_dataset))
+            if not use_dataset:
+                _set_series_data(scatter,
+                                 to_json_data(df[[x, y]], precision))
         for j in range(1, len(ys)):
             scatter.extend_axis(
                 yaxis=opts.AxisOpts(name=yaxis_names[j],
@@ -311,8 +502,12 @@ def get_scatter(df,
             )
     else:
         for y in ys:
-            scatter.add_yaxis(str(y),
-                              df[y].values.tolist())
+            scatter.add_yaxis(str(y), [], encode=_encode(x, y, use_dataset))
+            if not use_dataset:
+                _set_series_data(scatter,
+                                 to_json_data(df[[x, y]], precision))
+    if not use_dataset and xaxis_opts.get("type_") != "time":
+        scatter.add_xaxis(to_json_data(df[x], precision))
 
     scatter.set_series_opts(
         label_opts=opts.LabelOpts(**label_opts)
@@ -343,23 +538,25 @@ def get_scatter(df,
     return scatter
 
 
+@timed("build", _measure_build)
 def get_scatter3d(df,
                   x,
                   y,
                   z,
                   visualmap,
+                  precision,
                   init_opts,
                   title_opts,
                   xaxis_opts,
                   yaxis_opts,
                   zaxis_opts,
                   visualmap_opts):
-    scatter3d = Scatter3D(init_opts=opts.InitOpts(**init_opts))
+    scatter3d = charts.Scatter3D(init_opts=opts.InitOpts(**init_opts))
     scatter3d = (
         scatter3d
         .add(
             "",
-            data=df[[x, y, z]].values.tolist(),
+            data=to_json_data(df[[x, y, z]], precision),
             xaxis3d_opts=opts.Axis3DOpts(**xaxis_opts),
             yaxis3d_opts=opts.Axis3DOpts(**yaxis_opts),
             zaxis3d_opts=opts.Axis3DOpts(**zaxis_opts),
@@ -378,6 +575,13 @@ def get_scatter3d(df,
     return scatter3d
 
 
+def _box_data(boxplot, data):
+    # 箱线图的五个统计值同样按options["precision"]保留小数
+    return to_json_data(pd.DataFrame(boxplot.prepare_data(data)),
+                        as_list=True)
+
+
+@timed("build", _measure_build)
 def get_boxplot(df,
                 ys,
                 init_opts,
@@ -386,18 +590,18 @@ def get_boxplot(df,
                 xaxis_opts,
                 yaxis_opts,
                 datazoom_opts):
-    boxplot = Boxplot(init_opts=opts.InitOpts(**init_opts))
+    boxplot = charts.Boxplot(init_opts=opts.InitOpts(**init_opts))
 
     if all(isinstance(y, str) for y in ys):
         boxplot.add_xaxis(["expr"])
         for y in ys:
             boxplot.add_yaxis(str(y),
-                              boxplot.prepare_data([df[y].values.tolist()]))
+                              _box_data(boxplot, [df[y].values.tolist()]))
     elif all(isinstance(y, list) for y in ys):
         boxplot.add_xaxis([f"expr{i}" for i in range(1, len(ys[0])+1)])
         for y in ys:
             boxplot.add_yaxis("_".join(y),
-                              boxplot.prepare_data(df[y].values.T.tolist()))
+                              _box_data(boxplot, df[y].values.T.tolist()))
     else:
         raise ValueError(f"ys {ys} has unkonwn format")
     boxplot.set_global_opts(
@@ -415,6 +619,7 @@ def get_boxplot(df,
     return boxplot
 
 
+@timed("build", _measure_build)
 def get_funnel(df,
                x,
                y,
@@ -424,9 +629,9 @@ def get_funnel(df,
                label_opts,
                legend_opts,):
     funnel = (
-        Funnel(init_opts=opts.InitOpts(**init_opts))
+        charts.Funnel(init_opts=opts.InitOpts(**init_opts))
         .add(str(y),
-             df[[x, y]].values.tolist(),
+             to_json_data(df[[x, y]], as_list=True),
              sort_="ascending" if ascending else "desending",
              label_opts=opts.LabelOpts(**label_opts))
         .set_global_opts(
@@ -437,6 +642,7 @@ def get_funnel(df,
     return funnel
 
 
+@timed("build", _measure_build)
 def get_geo(df,
             x,
             ys,
@@ -453,10 +659,10 @@ def get_geo(df,
     if maptype is None or len(maptype) == 0:
         warnings.warn("Please specify argument maptype, e.g. 'china'")
 
-    geo = Geo(init_opts=opts.InitOpts(**init_opts))
+    geo = charts.Geo(init_opts=opts.InitOpts(**init_opts))
     geo.add_schema(maptype=maptype)
     for y in ys:
-        geo.add(str(y), df[[x, y]].values.tolist())
+        geo.add(str(y), to_json_data(df[[x, y]], as_list=True))
 
     geo.set_series_opts(label_opts=opts.LabelOpts(**label_opts))
     if visualmap:
@@ -471,6 +677,7 @@ def get_geo(df,
     return geo
 
 
+@timed("build", _measure_build)
 def get_map(df,
             x,
             y,
@@ -488,8 +695,8 @@ def get_map(df,
         warnings.warn("Please specify argument maptype, e.g. 'china'")
 
     map = (
-        Map(init_opts=opts.InitOpts(**init_opts))
-        .add(str(y), df[[x, y]].values.tolist(), maptype)
+        charts.Map(init_opts=opts.InitOpts(**init_opts))
+        .add(str(y), to_json_data(df[[x, y]], as_list=True), maptype)
         .set_series_opts(label_opts=opts.LabelOpts(**label_opts))
     )
 
@@ -505,11 +712,29 @@ def get_map(df,
     return map
 
 
+def _in_range(days, range_):
+    """mask of `days` inside a calendar's range, e.g. ["2021-01-01",
+    "2021-06-30"], "2021" or "2021-02"
+    """
+    try:
+        if isinstance(range_, (list, tuple)) and len(range_) == 2:
+            start, end = pd.to_datetime(list(range_))
+        else:
+            period = pd.Period(str(range_))
+            start, end = period.start_time, period.end_time
+    except (TypeError, ValueError):
+        return np.ones(len(days), dtype=bool)
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    return (days >= start) & (days <= end)
+
+
+@timed("build", _measure_build)
 def get_calender(df,
                  x,
                  y,
                  agg_func,
                  visualmap,
+                 precision,
                  init_opts,
                  title_opts,
                  visualmap_opts,
@@ -517,11 +742,18 @@ def get_calender(df,
     if agg_func is not None:
         df = df.groupby(x)[y].agg(agg_func).reset_index()
 
-    calendar = (
-        Calendar(init_opts=opts.InitOpts(**init_opts))
-        .add(str(y), df[[x, y]].values.tolist(),
-             calendar_opts=opts.CalendarOpts(**calendar_opts))
-    )
+    # x是按天取整的datetime64，只格式化出现的日期
+    days = df[x].values.astype("datetime64[D]")
+    labels = format_days(days)
+    calendar = charts.Calendar(init_opts=opts.InitOpts(**init_opts))
+    for i, calendar_opts_ in enumerate(calendar_opts):
+        keep = _in_range(days, calendar_opts_.get("range_"))
+        data = pd.DataFrame({x: labels[keep], y: df[y].values[keep]})
+        calendar.add(str(y), to_json_data(data, precision),
+                     calendar_index=i if len(calendar_opts) > 1 else None,
+                     calendar_opts=opts.CalendarOpts(**calendar_opts_))
+    # 每个日历添加一个序列，图例只保留一个
+    calendar.options["legend"][0]["data"] = [str(y)]
 
     if visualmap:
         calendar.set_global_opts(
@@ -535,6 +767,7 @@ def get_calender(df,
     return calendar
 
 
+@timed("build", _measure_build)
 def get_wordcloud(df,
                   x,
                   y,
@@ -546,8 +779,8 @@ def get_wordcloud(df,
         df = df.groupby(x)[y].agg(agg_func).reset_index()
 
     wordcloud = (
-        WordCloud(init_opts=opts.InitOpts(**init_opts))
-        .add(str(y), df[[x, y]].values.tolist())
+        charts.WordCloud(init_opts=opts.InitOpts(**init_opts))
+        .add(str(y), to_json_data(df[[x, y]], as_list=True))
         .set_global_opts(
             title_opts=opts.TitleOpts(**title_opts),
             tooltip_opts=opts.TooltipOpts(**tooltip_opts)
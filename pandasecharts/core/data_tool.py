@@ -1,10 +1,234 @@
 import numpy as np
 import pandas as pd
 from ..configs.basic_cfg import options
+from .profile_tool import timed
 
 
+@timed("select_columns",
+       lambda args, kwargs, df: {"rows": len(df), "points": df.size})
+def select_columns(df, *columns):
+    """select only the columns a chart refers to
+
+    `columns` may be column names, lists of names (e.g. `ys`) or None,
+    the result is a new narrow frame, so converting its columns never
+    touches the caller's frame.
+    """
+    names = []
+    for col in columns:
+        if col is None:
+            continue
+        cols = col if isinstance(col, list) else [col]
+        for c in cols:
+            # boxplot的ys可能是list of list
+            for name in (c if isinstance(c, list) else [c]):
+                if name not in names:
+                    names.append(name)
+    # 浅拷贝去掉pandas的视图标记，避免之后赋值时的SettingWithCopyWarning
+    return df[names].copy(deep=False)
+
+
+@timed("sort", lambda args, kwargs, df: {"rows": len(df)})
+def sort_by(df, x, is_sorted=None):
+    """`df.sort_values(by=x)`, skipped when `x` is already in order
+
+    `is_sorted` is the known monotonicity of `x`, e.g. from
+    `ColumnStats.is_monotonic`, checked here if None.
+    """
+    if is_sorted is None:
+        is_sorted = df[x].is_monotonic_increasing
+    if is_sorted:
+        return df
+    return df.sort_values(by=x)
+
+
+def _group_keys(x, by=None, timeline=None):
+    keys = []
+    for key in (timeline, by, x):
+        if key is not None and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _group_by(df, key):
+    # 列名和index的名称相同时按index分组，见_reset_keys
+    if key in df.index.names and key in df.columns:
+        return df.index.get_level_values(key)
+    return key
+
+
+def _reset_keys(result, x, ys, by=None, timeline=None):
+    """`result.reset_index()`, except for `by` or `timeline` in `ys`
+
+    the column of such a key holds the aggregated values, so its group
+    values are kept as an index level, which `iter_groups` groups by.
+    """
+    ys = ys if isinstance(ys, list) else [ys]
+    index_keys = [key for key in (timeline, by)
+                  if key is not None and key != x and key in ys]
+    if not index_keys:
+        return result.reset_index()
+    levels = [name for name in result.index.names if name not in index_keys]
+    return result.reset_index(level=levels)
+
+
+@timed("aggregate",
+       lambda args, kwargs, df: {"rows": len(args[0]), "points": len(df)})
+def aggregate(df, x, ys, agg_func, by=None, timeline=None, resample=None):
+    """aggregate `ys` by `x` within every (timeline, by) group at once
+
+    equals to `df.groupby(x)[ys].agg(agg_func)` applied to every sub
+    dataframe cut out by `timeline` and `by`, but done in a single
+    groupby.
+
+    Args:
+    ---
+        resample: str, optional. Defaults to None
+            pandas offset alias, e.g. "5min". If given, the datetime `x`
+            is bucketed by `pd.Grouper(key=x, freq=resample)` instead of
+            grouped by exact values, buckets without rows are dropped.
+    """
+    keys = []
+    for key in _group_keys(x, by, timeline):
+        if resample is not None and key == x:
+            keys.append(pd.Grouper(key=x, freq=resample))
+        else:
+            keys.append(_group_by(df, key))
+    grouped = df.groupby(keys, observed=True)
+    result = grouped[ys].agg(agg_func)
+    if resample is not None:
+        # 只按时间分桶时，pandas会补上没有数据的桶
+        result = result[grouped.size().reindex(result.index).values > 0]
+    return _reset_keys(result, x, ys, by, timeline)
+
+
+# 分块聚合时每个agg_func需要保留的中间结果，以及中间结果的合并方式
+STREAM_AGG_FUNCS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "mean": ("sum", "count"),
+    "min": ("min",),
+    "max": ("max",),
+}
+_COMBINE_FUNCS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+def aggregate_chunks(chunks, x, ys, agg_func, by=None, timeline=None,
+                     convert=None):
+    """same as `aggregate`, but consume an iterator of dataframe chunks
+
+    only partial aggregates of every (timeline, by, x) key are kept
+    between chunks, so memory is bounded by the number of distinct keys
+    instead of the number of rows.
+
+    Args:
+    ---
+        chunks: iterable of pd.DataFrame
+            e.g. `pd.read_csv(..., chunksize=...)`.
+        agg_func: str
+            one of "sum", "count", "mean", "min", "max".
+        convert: callable, optional. Defaults to None
+            applied to every (projected) chunk before aggregating.
+    """
+    if agg_func not in STREAM_AGG_FUNCS:
+        raise ValueError(f"agg_func should be one of "
+                         f"{list(STREAM_AGG_FUNCS)}, got {agg_func}")
+    keys = _group_keys(x, by, timeline)
+    levels = list(range(len(keys)))
+    partials = {}
+    for chunk in chunks:
+        chunk = select_columns(chunk, keys, ys)
+        if convert is not None:
+            chunk = convert(chunk)
+        grouped = chunk.groupby(keys, observed=True)[ys]
+        for func in STREAM_AGG_FUNCS[agg_func]:
+            part = grouped.agg(func)
+            if func in partials:
+                part = (pd.concat([partials[func], part])
+                        .groupby(level=levels)
+                        .agg(_COMBINE_FUNCS[func]))
+            partials[func] = part
+
+    if not partials:
+        raise ValueError("chunks is empty")
+    if agg_func == "mean":
+        result = partials["sum"] / partials["count"]
+    else:
+        result = partials[agg_func]
+    return _reset_keys(result, x, ys, by, timeline)
+
+
+@timed("to_category",
+       lambda args, kwargs, res: {"rows": len(args[0]),
+                                  "points": _n_categories(res)})
+def to_category(series, stats=None):
+    """same values as `series.astype(str)`, stored as a categorical
+
+    the column is factorized once and only its unique values are turned
+    into strings, instead of creating a python string for every row.
+    Categories are sorted as strings, so grouping and sorting by the
+    integer codes give the same order as the string column.
+
+    Args:
+    ---
+        stats: ColumnStats, optional. Defaults to None
+            stats of the values of `series`. If most valid values are
+            distinct, factorizing saves nothing, and `series.astype(str)`
+            is returned directly.
+    """
+    if stats is not None:
+        n_valid = len(series) - stats.null_count
+        if n_valid and stats.n_unique * 2 > n_valid:
+            return series.astype(str)
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    labels = pd.Series(uniques).astype(str)
+    valid = labels.notna().values
+    names = labels.values[valid]
+    if len(set(names)) != len(names):
+        # 不同的值转为相同的字符串，例如1和"1"
+        return series.astype(str)
+    order = np.argsort(np.asarray(names, dtype=object), kind="stable")
+    rank = np.full(len(labels), -1, dtype=np.intp)
+    rank[np.flatnonzero(valid)[order]] = np.arange(len(order))
+    categories = pd.Index(names[order], dtype=labels.dtype)
+    values = pd.Categorical.from_codes(rank[codes], categories=categories)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _n_categories(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return len(series.cat.categories)
+    return None
+
+
+def _sample(series, size, seed=0):
+    if not size or len(series) <= size:
+        return series
+    positions = np.random.default_rng(seed).choice(len(series), size,
+                                                   replace=False)
+    return series.iloc[np.sort(positions)]
+
+
+@timed("infer_dtype", lambda args, kwargs, res: {"rows": len(args[0])})
 def infer_dtype(series):
-    if pd.api.types.infer_dtype(series) == "string":
+    """"category" for string columns, otherwise "value"
+
+    the dtype is checked first, only object columns are scanned, and
+    at most `options["infer_sample_size"]` randomly sampled rows of them.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # 只需要推断类别的类型
+        series = series.cat.categories
+    if series.dtype.kind in "biufcmM":
+        return "value"
+    if isinstance(series.dtype, pd.StringDtype):
+        return "category"
+    sample_size = options.get("infer_sample_size")
+    inferred = pd.api.types.infer_dtype(_sample(series, sample_size))
+    if inferred == "empty" and sample_size and len(series) > sample_size:
+        # 抽样的都是空值时，只在非空值中抽样
+        inferred = pd.api.types.infer_dtype(
+            _sample(series.dropna(), sample_size))
+    if inferred == "string":
         return "category"
     else:
         return "value"
@@ -23,21 +247,249 @@ def _freedman_diaconis_bins(a):
         return int(np.ceil((a.max() - a.min()) / h))
 
 
-def _categorize_array(a, bins=None):
+def _as_float_array(a):
     a = np.asarray(a)
-    if bins is not None:
-        if len(a) < bins:
-            return a
+    if a.dtype.kind in "mM":
+        isnat = np.isnat(a)
+        a = a.view("i8").astype(float)
+        a[isnat] = np.nan
+        return a
+    return a.astype(float)
+
+
+def _histogram_bin_edges(a, bins=None):
     if bins is None:
         bins = min(_freedman_diaconis_bins(a), options.get("max_bins"))
-    _, bin_edges = np.histogram(a, bins)
-    cat_a = np.digitize(a, bins=bin_edges)
-    cat2region = dict(
-        zip(range(1, bins+1), zip(bin_edges[:-1], bin_edges[1:])))
-    region_a = [cat2region[min(c, bins)][0] for c in cat_a]
-    return region_a
+    return np.histogram_bin_edges(a, bins)
+
+
+def _count_distinct(a):
+    counts = pd.Series(a).value_counts(sort=False).sort_index()
+    # categorical类型中未出现的类别计数为0，去掉
+    counts = counts[counts > 0]
+    return counts.index.values, counts.values
+
+
+@timed("count_values",
+       lambda args, kwargs, res: {"rows": len(args[0]),
+                                  "points": len(res[0])})
+def count_values(a, dtype, bins=None):
+    """count the distribution of `a` without building a per row column
+
+    if `dtype` is "value", values are counted by histogram bins and
+    labeled by the left edge of each bin, otherwise every distinct value
+    is counted.
+    empty bins and NaN are dropped, labels are sorted ascending.
+
+    Returns:
+    ---
+        tuple of two ndarray: labels and counts
+    """
+    if dtype == "value":
+        a = np.asarray(a)
+        if bins is not None and len(a) < bins:
+            # 数据量比bins少时直接统计原始值
+            return _count_distinct(a)
+        a = _as_float_array(a)
+        a = a[~np.isnan(a)]
+        counts, bin_edges = np.histogram(a, _histogram_bin_edges(a, bins))
+        non_empty = counts > 0
+        return bin_edges[:-1][non_empty], counts[non_empty]
+    return _count_distinct(a)
+
+
+def _lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets, return indices of kept points"""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+    # 首尾两点固定保留，中间的点平均分为n_out-2个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # 每个桶和下一个桶的均值点以及上一个选中的点构成三角形
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + np.argmax(area)
+        selected[i + 1] = a
+    return selected
+
+
+def _minmax_indices(x, y, n_out):
+    """keep the min and max point of every bucket, return kept indices
+
+    the first and last points are always kept and counted in `n_out`,
+    the points between them are split into (n_out - 2) // 2 buckets.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    ends = np.array([0, n - 1])[:max(n_out, 0)]
+    n_buckets = (n_out - 2) // 2
+    if n_buckets < 1:
+        return ends
+    inner = y[1:-1]
+    edges = np.linspace(0, n - 2, n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    indices = [ends]
+    for reduce_ in (np.minimum, np.maximum):
+        extreme = reduce_.reduceat(inner, edges[:-1])
+        hit = np.flatnonzero(inner == extreme[bucket])
+        # 同一个桶内可能有多个点等于极值，只保留第一个
+        _, first = np.unique(bucket[hit], return_index=True)
+        indices.append(hit[first] + 1)
+    return np.unique(np.concatenate(indices))
+
+
+_DOWNSAMPLE_FUNCS = {
+    "lttb": _lttb_indices,
+    "minmax": _minmax_indices,
+}
+
+
+def _axis_values(series):
+    if series.dtype.kind in "mM":
+        return series.values.view("i8").astype(float)
+    if series.dtype.kind in "iufb":
+        return series.values.astype(float)
+    # 类别型的x按位置计算
+    return np.arange(len(series), dtype=float)
+
+
+@timed("downsample",
+       lambda args, kwargs, df: {"rows": len(args[0]), "points": len(df)})
+def downsample(df, x, ys, method, n_points=None):
+    """downsample rows of `df` so that each y keeps about `n_points` points
+
+    Args:
+    ---
+        method: str or None
+            "lttb" (Largest-Triangle-Three-Buckets) or "minmax" (min and
+            max of every bucket), if None, `df` is returned as is.
+        n_points: int, optional. Defaults to None
+            point budget, if None, use `options["downsample_points"]`.
+            the budget is split evenly among ys, the first and last
+            points included, rows kept by any y are kept for all of
+            them, since they share one x axis.
+    """
+    if method is None:
+        return df
+    if method not in _DOWNSAMPLE_FUNCS:
+        raise ValueError(f"downsample should be one of "
+                         f"{list(_DOWNSAMPLE_FUNCS)}, got {method}")
+    if n_points is None:
+        n_points = options.get("downsample_points")
+    if len(df) <= n_points:
+        return df
+
+    func = _DOWNSAMPLE_FUNCS[method]
+    n_out = n_points // len(ys)
+    x_values = _axis_values(df[x])
+    keep = []
+    for y in ys:
+        y_values = df[y].values.astype(float)
+        valid = np.flatnonzero(~np.isnan(y_values))
+        keep.append(valid[func(x_values[valid], y_values[valid], n_out)])
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+def is_datetime(series):
+    return pd.api.types.is_datetime64_any_dtype(series.dtype)
+
+
+@timed("to_epoch_ms", lambda args, kwargs, res: {"rows": len(args[0])})
+def to_epoch_ms(a: pd.Series):
+    """milliseconds since epoch of datetimes, used by ECharts time axis
+
+    values are taken from the int64 buffer of the column, non datetime
+    columns are parsed by `pd.to_datetime` first, NaT becomes NaN.
+    """
+    if not is_datetime(a):
+        a = pd.to_datetime(a)
+    index = pd.DatetimeIndex(a)
+    # 时区时间的asi8是UTC时间
+    ms = index.as_unit("ns").asi8 // 1_000_000
+    missing = index.isna()
+    if missing.any():
+        ms = ms.astype(float)
+        ms[missing] = np.nan
+    return pd.Series(ms, index=a.index, name=a.name)
+
+
+@timed("to_days", lambda args, kwargs, res: {"rows": len(args[0])})
+def to_days(a: pd.Series, format=None):
+    """parse `a` into dates and floor them to days
+
+    strings are parsed once for every unique value, and the result is a
+    datetime64 column of days, so grouping and min/max run on integers.
+    timezone aware datetimes keep their local dates.
+    """
+    if a.dtype.kind == "M" or isinstance(a.dtype, pd.DatetimeTZDtype):
+        days = _floor_days(pd.DatetimeIndex(a))
+    else:
+        codes, uniques = pd.factorize(a)
+        unique_days = _floor_days(pd.to_datetime(uniques, format=format))
+        # 缺失值的code为-1，对应最后添加的NaT
+        days = np.append(unique_days, np.datetime64("NaT"))[codes]
+    return pd.Series(days.astype("datetime64[s]"), index=a.index,
+                     name=a.name)
+
+
+def _floor_days(index):
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]")
+
+
+def format_days(days):
+    """format datetime64 values as "%Y-%m-%d", only once per unique day"""
+    codes, uniques = pd.factorize(np.asarray(days).astype("datetime64[D]"))
+    labels = np.datetime_as_string(np.asarray(uniques, dtype="datetime64[D]"),
+                                   unit="D").astype(object)
+    return np.append(labels, None)[codes]
+
+
+def _to_datetime(a, format=None):
+    return a if is_datetime(a) else pd.to_datetime(a, format=format)
+
+
+# convert_columns可用的转换
+_CONVERTERS = {
+    "category": to_category,
+    "time": to_epoch_ms,
+    "datetime": _to_datetime,
+    "days": to_days,
+}
+
 
+def convert_columns(df, converters, column_stats=None):
+    """convert columns of `df` inplace and return it
 
-def to_datetime(a: pd.Series, format):
-    a = pd.to_datetime(a, format=format).astype(str)
-    return a
+    Args:
+    ---
+        converters: dict
+            column name to the name of a conversion, or a tuple of the
+            name and its arguments, e.g. {x: ("days", "%Y%m%d")}. Names
+            are "category" (`to_category`), "time" (`to_epoch_ms`),
+            "datetime" (`pd.to_datetime`) and "days" (`to_days`).
+        column_stats: callable, optional. Defaults to None
+            `column_stats(col)` returns the `ColumnStats` of the column
+            before conversion, passed to `to_category`.
+    """
+    for col, spec in converters.items():
+        name, *args = spec if isinstance(spec, tuple) else (spec,)
+        if name == "category" and column_stats is not None:
+            args = [column_stats(col)]
+        df[col] = _CONVERTERS[name](df[col], *args)
+    return df
@@ -0,0 +1,21 @@
+import importlib
+
+
+class LazyModule:
+    """a module imported on first attribute access
+
+    importing pyecharts loads all of its charts, options and templates,
+    so it is deferred until a chart is actually built.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name):
+    return LazyModule(name)
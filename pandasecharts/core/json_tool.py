@@ -0,0 +1,134 @@
+import json
+import numpy as np
+import pandas as pd
+import simplejson
+from simplejson import RawJSON
+from ..configs.basic_cfg import options
+from .profile_tool import timed
+
+
+# pandas的to_json最多保留15位小数
+MAX_PRECISION = 15
+# 少于这个数量的数据直接用tolist
+SMALL_DATA_SIZE = 1000
+# 全精度输出时，绝对值不超过该值的整数值浮点数可以用to_json无损输出
+_MAX_EXACT_INTEGER = 2 ** 53
+
+
+# 紧凑的json分隔符，和pandas的to_json一致
+_SEPARATORS = (",", ":")
+
+
+def _is_compact_dtype(dtype):
+    if dtype.kind in "iub":
+        return True
+    if dtype.kind == "f":
+        return True
+    if isinstance(dtype, pd.CategoricalDtype):
+        # 例如to_category转换后的x，to_json按类别的值输出，
+        # 浮点数的类别可能被to_json截断精度
+        categories = dtype.categories.dtype
+        return categories.kind != "f" and _is_compact_dtype(categories)
+    # object类型的列可能包含任意python对象，仍然按原来的方式处理
+    return (pd.api.types.is_string_dtype(dtype)
+            and not pd.api.types.is_object_dtype(dtype))
+
+
+def _keeps_precision(values):
+    # to_json最多输出15位小数，只有整数值的浮点数能保证无损
+    values = values[np.isfinite(values)]
+    return (values.size == 0
+            or (np.abs(values).max() <= _MAX_EXACT_INTEGER
+                and bool(np.all(values == np.trunc(values)))))
+
+
+def _tolist(data, dtypes):
+    kinds = {d.kind for d in dtypes}
+    if "f" in kinds and kinds & set("iu"):
+        # 混合类型时values会把整数转为浮点数，例如时间轴的毫秒数
+        columns = [data.iloc[:, i].tolist() for i in range(len(dtypes))]
+        return [list(row) for row in zip(*columns)]
+    return data.values.tolist()
+
+
+def _measure(args, kwargs, result):
+    if isinstance(result, RawJSON):
+        nbytes = len(result.encoded_json)
+    else:
+        # tolist的结果只在记录时才编码一次，用来统计字节数
+        from pyecharts.charts.base import default
+        try:
+            nbytes = len(simplejson.dumps(result, default=default,
+                                          ignore_nan=True,
+                                          separators=_SEPARATORS))
+        except (TypeError, ValueError):
+            nbytes = None
+    return {"rows": len(args[0]), "points": args[0].size, "bytes": nbytes}
+
+
+def _dumps_exact(data, dtypes):
+    """encode float data keeping the shortest repr of every float"""
+    rows = _tolist(data, dtypes)
+    if not all(d.kind in "iufb" for d in dtypes):
+        return simplejson.dumps(rows, ignore_nan=True, separators=_SEPARATORS)
+    # 纯数值时用标准库的C编码器，比simplejson快一倍，
+    # 它把NaN和inf写成NaN和Infinity，数值数据中不会有其他同名的字符串
+    text = json.dumps(rows, separators=_SEPARATORS)
+    if "NaN" in text or "Infinity" in text:
+        text = (text.replace("-Infinity", "null")
+                .replace("Infinity", "null")
+                .replace("NaN", "null"))
+    return text
+
+
+@timed("to_json_data", _measure)
+def to_json_data(data, precision=None, as_list=False):
+    """convert a Series or DataFrame to data of chart options
+
+    numeric and string columns are encoded by pandas' C json encoder
+    straight from the typed buffers, and wrapped in `simplejson.RawJSON`,
+    which pyecharts dumps as is, so no python object is created per cell.
+    other columns, and data with no more than `SMALL_DATA_SIZE` values,
+    are converted to python lists.
+
+    Args:
+    ---
+        data: pd.Series or pd.DataFrame
+            a DataFrame is encoded as a list of rows, e.g. [[x, y], ...].
+        precision: int, optional. Defaults to None
+            number of decimals kept for float values. If None, same as
+            `options["precision"]`, if that is None too, floats are kept
+            in full precision: pandas' encoder writes at most 15
+            decimals, so only integral floats are encoded by it, other
+            float data is encoded from `tolist` by the json encoders,
+            which keep the shortest repr of every float. That is about
+            twice as slow as pandas' encoder, set a precision for speed.
+        as_list: bool, optional. Defaults to False
+            always return python lists, for pyecharts charts which read
+            the data items, e.g. `Pie` and `Map`.
+    """
+    if precision is None:
+        precision = options.get("precision")
+    is_series = isinstance(data, pd.Series)
+    dtypes = [data.dtype] if is_series else data.dtypes.tolist()
+    is_compact = all(_is_compact_dtype(dtype) for dtype in dtypes)
+
+    if not is_compact or as_list or data.size <= SMALL_DATA_SIZE:
+        # 数据量很小时，to_json的固定开销比tolist大得多
+        if precision is not None and any(d.kind == "f" for d in dtypes):
+            data = data.round(min(max(int(precision), 0), MAX_PRECISION))
+        return _tolist(data, dtypes)
+
+    if precision is None:
+        for i, dtype in enumerate(dtypes):
+            if dtype.kind != "f":
+                continue
+            values = data.values if is_series else data.iloc[:, i].values
+            if not _keeps_precision(values):
+                # 按repr输出浮点数，不丢失精度
+                return RawJSON(_dumps_exact(data, dtypes))
+        precision = MAX_PRECISION
+    precision = min(max(int(precision), 0), MAX_PRECISION)
+    return RawJSON(data.to_json(orient="values",
+                                double_precision=precision,
+                                force_ascii=False))
@@ -0,0 +1,218 @@
+import os
+import time
+import functools
+import threading
+from contextlib import contextmanager
+
+
+FIELDS = ["method", "stage", "group", "seconds", "rows", "points", "bytes"]
+
+# 所有接收记录的回调函数，为空时不做任何计时
+_callbacks = []
+_local = threading.local()
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _Stage:
+    def __init__(self, name, info, record=True):
+        self.name = name
+        self.info = info
+        self.record = record
+
+    def __enter__(self):
+        stack = _stack()
+        parent = stack[-1] if stack else None
+        # 没有指定时，method和group继承外层的阶段
+        for key in ("method", "group"):
+            if self.info.get(key) is None and parent is not None:
+                self.info[key] = parent.info.get(key)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def update(self, **info):
+        self.info.update(info)
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        _stack().pop()
+        if self.record:
+            record = {key: self.info.get(key) for key in FIELDS}
+            record["stage"] = self.name
+            record["seconds"] = seconds
+            for callback in list(_callbacks):
+                callback(record)
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def update(self, **info):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, **info):
+    """time the block as stage `name` when profiling is on
+
+    e.g. `with stage("sort", rows=len(df)): ...`, the returned object's
+    `update(points=..., bytes=...)` adds information found in the block.
+    If no callback is registered, a shared no-op context is returned.
+    """
+    if not _callbacks:
+        return _NULL_STAGE
+    return _Stage(name, info)
+
+
+def group(label):
+    """mark stages in the block as belonging to a `by`/`timeline` group"""
+    if not _callbacks:
+        return _NULL_STAGE
+    return _Stage("group", {"group": label}, record=False)
+
+
+def timed(name, measure=None):
+    """decorator that records every call of a function as stage `name`
+
+    Args:
+    ---
+        name: str
+            stage name.
+        measure: callable, optional. Defaults to None
+            `measure(args, kwargs, result)` returns a dict of "rows",
+            "points" or "bytes" of the call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _callbacks:
+                return func(*args, **kwargs)
+            with _Stage(name, {}) as stage_:
+                result = func(*args, **kwargs)
+                if measure is not None:
+                    stage_.update(**measure(args, kwargs, result))
+            return result
+        return wrapper
+    return decorator
+
+
+def profiled(method):
+    """record an accessor method call as stage "call", see `timed`"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _callbacks:
+            return method(self, *args, **kwargs)
+        info = {"method": method.__qualname__, "rows": len(self._obj)}
+        with _Stage("call", info):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class Profile:
+    """records collected by `profile()`
+
+    every record is a dict with keys "method", "stage", "group",
+    "seconds", "rows", "points" and "bytes", stages are recorded when
+    they finish, so a "call" comes after the stages inside it.
+    """
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.records, columns=FIELDS)
+
+    def summary(self):
+        """total seconds, rows, points and bytes of every stage"""
+        df = self.to_frame()
+        return (df.groupby(["method", "stage"], sort=False, dropna=False)
+                .agg(calls=("seconds", "size"), seconds=("seconds", "sum"),
+                     rows=("rows", "sum"), points=("points", "sum"),
+                     bytes=("bytes", "sum")))
+
+
+def _rendered_bytes(name, result):
+    if name == "render":
+        # render返回写入的html文件路径
+        return os.path.getsize(result) if os.path.isfile(result) else None
+    html = getattr(result, "data", result)
+    return len(html.encode("utf-8")) if isinstance(html, str) else None
+
+
+def _timed_render(func, name):
+    @functools.wraps(func)
+    def wrapper(chart, *args, **kwargs):
+        if not _callbacks:
+            return func(chart, *args, **kwargs)
+        method = f"{type(chart).__name__}.{name}"
+        with _Stage("render", {"method": method}) as stage_:
+            result = func(chart, *args, **kwargs)
+            stage_.update(bytes=_rendered_bytes(name, result))
+        return result
+    wrapper._profiled = True
+    return wrapper
+
+
+def _patch_render():
+    """record `render`, `render_embed` and `render_notebook` of pyecharts
+    charts as stage "render", the methods are patched once and do nothing
+    more than calling the original ones when profiling is off
+    """
+    from pyecharts.charts.base import Base
+    from pyecharts.charts import Page, Tab
+
+    for cls in (Base, Page, Tab):
+        for name in ("render", "render_embed", "render_notebook"):
+            func = cls.__dict__.get(name)
+            if func is not None and not getattr(func, "_profiled", False):
+                setattr(cls, name, _timed_render(func, name))
+
+
+def add_profile_callback(callback):
+    """call `callback(record)` for every finished stage, see `Profile`"""
+    _patch_render()
+    _callbacks.append(callback)
+
+
+def remove_profile_callback(callback):
+    _callbacks.remove(callback)
+
+
+@contextmanager
+def profile():
+    """record the stages of charts built in the block
+
+    charts rendered in the block by `render`, `render_embed` or
+    `render_notebook` are recorded as stage "render" with html bytes.
+    e.g.
+
+        with pandasecharts.profile() as p:
+            df.echart.bar("x", ["y"], agg_func="sum", by="g")
+        print(p.summary())
+
+    Returns:
+    ---
+        Profile: collected records.
+    """
+    profile_ = Profile()
+    add_profile_callback(profile_)
+    try:
+        yield profile_
+    finally:
+        remove_profile_callback(profile_)
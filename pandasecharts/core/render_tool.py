@@ -0,0 +1,94 @@
+import os
+import time
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from pyecharts.commons import utils
+from pyecharts.globals import CurrentConfig, RenderSepType
+from pyecharts.render.engine import RenderEngine
+from .profile_tool import stage
+
+
+def _template_name(chart):
+    # 和chart.render默认使用的模板一致，例如Page使用simple_page.html
+    signature = inspect.signature(type(chart).render)
+    return signature.parameters["template_name"].default
+
+
+def _render_one(chart, template, path):
+    with stage("render", group=os.path.basename(path)) as stage_:
+        seconds, nbytes = _write_html(chart, template, path)
+        stage_.update(bytes=nbytes)
+    return seconds, nbytes
+
+
+def _write_html(chart, template, path):
+    start = time.perf_counter()
+    chart._prepare_render()
+    html = utils.replace_placeholder(
+        template.render(chart=RenderEngine.generate_js_link(chart))
+    )
+    if RenderSepType.SepType != "\n":
+        html = html.replace("\n", RenderSepType.SepType)
+    data = html.encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    return time.perf_counter() - start, len(data)
+
+
+def render_many(charts, out_dir, workers=None, env=None):
+    """render many charts to html files concurrently
+
+    templates are loaded once and shared by all charts, and files are
+    rendered and written by a thread pool, so writing overlaps with the
+    rendering of other charts.
+
+    Args:
+    ---
+        charts: list or dict
+            charts returned by `df.echart.xxx`, If dict, keys are used as
+            file names, otherwise files are named `chart_0.html`, ...
+        out_dir: str
+            directory to write html files, created if not exists.
+        workers: int, optional. Defaults to None
+            number of threads, If None, same as the default of
+            `concurrent.futures.ThreadPoolExecutor`.
+        env: jinja2.Environment, optional. Defaults to None
+            same as `env` of pyecharts `render`.
+
+    Returns:
+    ---
+        pd.DataFrame: one row per chart, with columns "name", "path",
+            "seconds" and "bytes", in the same order as `charts`.
+    """
+    if isinstance(charts, dict):
+        names = [str(name) for name in charts]
+        charts = list(charts.values())
+    else:
+        charts = list(charts)
+        names = [f"chart_{i}" for i in range(len(charts))]
+    names = [name if name.endswith(".html") else f"{name}.html"
+             for name in names]
+
+    os.makedirs(out_dir, exist_ok=True)
+    env = env or CurrentConfig.GLOBAL_ENV
+    templates = {}
+    for chart in charts:
+        template_name = _template_name(chart)
+        if template_name not in templates:
+            templates[template_name] = env.get_template(template_name)
+
+    paths = [os.path.abspath(os.path.join(out_dir, name)) for name in names]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda args: _render_one(*args),
+            [(chart, templates[_template_name(chart)], path)
+             for chart, path in zip(charts, paths)]
+        ))
+
+    return pd.DataFrame({
+        "name": names,
+        "path": paths,
+        "seconds": [seconds for seconds, _ in results],
+        "bytes": [nbytes for _, nbytes in results],
+    })
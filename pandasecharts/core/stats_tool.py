@@ -0,0 +1,237 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from .data_tool import infer_dtype
+from .profile_tool import timed
+
+
+# 保存统计信息的pandas对象属性名
+_STATS_ATTR = "_echart_stats"
+# 线性计数估计不同值的个数时使用的位图大小
+_BITMAP_SIZE = 1 << 16
+
+
+class ColumnStats:
+    """facts about a column, each computed on first use
+
+    Attributes:
+    ---
+        kind: str
+            "value" or "category", same as `infer_dtype`.
+        min, max: scalar or None
+            NaN-aware minimum and maximum as python scalars, None if the
+            column isn't numeric or has no valid values.
+        null_count: int
+            number of missing values.
+        is_monotonic: bool
+            same as `series.is_monotonic_increasing`.
+        n_unique: int
+            approximate number of distinct valid values.
+        digest: bytes
+            hash of the values and their order, used by the chart cache.
+    """
+    def __init__(self, series):
+        self._series = series
+        self._facts = {}
+
+    def _get(self, name):
+        if name not in self._facts:
+            self._facts.update(_FACTS[name](self._series))
+        return self._facts[name]
+
+    kind = property(lambda self: self._get("kind"))
+    min = property(lambda self: self._get("min"))
+    max = property(lambda self: self._get("max"))
+    null_count = property(lambda self: self._get("null_count"))
+    is_monotonic = property(lambda self: self._get("is_monotonic"))
+    n_unique = property(lambda self: self._get("n_unique"))
+    digest = property(lambda self: self._get("digest"))
+
+    def is_stats_of(self, series):
+        """whether the stats are still valid for `series`
+
+        the stats keep a reference to the column, so pandas' copy on write
+        copies the column before any inplace change, the column is then
+        unchanged as long as it shares the same buffer. Without copy on
+        write an inplace change keeps the buffer, so the stats are never
+        reused.
+        """
+        if not copy_on_write():
+            return False
+        a, b = self._series.values, series.values
+        if isinstance(a, np.ndarray) and isinstance(b, np.ndarray):
+            return (a.__array_interface__ == b.__array_interface__
+                    and len(a) == len(b))
+        return a is b
+
+
+def _approx_n_unique(series):
+    # 线性计数，哈希到位图后根据空位比例估计
+    hashes = pd.util.hash_pandas_object(series.dropna(), index=False).values
+    if len(hashes) == 0:
+        return 0
+    used = np.zeros(_BITMAP_SIZE, dtype=bool)
+    used[hashes & np.uint64(_BITMAP_SIZE - 1)] = True
+    empty = _BITMAP_SIZE - int(used.sum())
+    if empty == 0:
+        return len(hashes)
+    estimate = -_BITMAP_SIZE * np.log(empty / _BITMAP_SIZE)
+    return int(min(round(estimate), len(hashes)))
+
+
+def copy_on_write():
+    """whether pandas copies a column before changing it inplace
+
+    always on since pandas 3.0, optional in pandas 2.x.
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        # pandas 1.x没有这个选项
+        return False
+
+
+@timed("column_digest", lambda args, kwargs, res: {"rows": len(args[0])})
+def column_digest(series):
+    """hash of the values of a column, index is ignored"""
+    digest = hashlib.sha1(usedforsecurity=False)
+    values = series.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biufcmM":
+        # 数值列直接对内存计算哈希，比hash_pandas_object快很多
+        digest.update(np.ascontiguousarray(values).view(np.uint8))
+    else:
+        # 图表只和数据的值及行的顺序有关，和index无关
+        hashes = pd.util.hash_pandas_object(series, index=False)
+        digest.update(hashes.values)
+    return digest.digest()
+
+
+def _scalar(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def _is_numeric(values):
+    return isinstance(values, np.ndarray) and values.dtype.kind in "biuf"
+
+
+@timed("column_stats", lambda args, kwargs, res: {"rows": len(args[0])})
+def _scan(series):
+    """min, max, null count and monotonicity of a column
+
+    numeric columns are scanned once by numpy, other columns fall back
+    to pandas.
+    """
+    values = series.values
+    if not _is_numeric(values):
+        try:
+            min_, max_ = _scalar(series.min()), _scalar(series.max())
+            if not isinstance(min_, (int, float)) or pd.isna(min_):
+                min_ = max_ = None
+        except TypeError:
+            min_ = max_ = None
+        try:
+            is_monotonic = series.is_monotonic_increasing
+        except TypeError:
+            is_monotonic = False
+        return {"min": min_, "max": max_,
+                "null_count": int(series.isna().sum()),
+                "is_monotonic": is_monotonic}
+
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        null_count = int(missing.sum())
+        valid = values[~missing] if null_count else values
+    else:
+        null_count = 0
+        valid = values
+    if len(valid):
+        min_, max_ = _scalar(valid.min()), _scalar(valid.max())
+    else:
+        min_ = max_ = None
+    is_monotonic = (null_count == 0
+                    and bool(np.all(values[1:] >= values[:-1])))
+    return {"min": min_, "max": max_, "null_count": null_count,
+            "is_monotonic": is_monotonic}
+
+
+def _scan_monotonic(series):
+    if _is_numeric(series.values):
+        return _scan(series)
+    # 非数值列单独判断，避免计算用不到的最小最大值
+    try:
+        return {"is_monotonic": series.is_monotonic_increasing}
+    except TypeError:
+        return {"is_monotonic": False}
+
+
+_FACTS = {
+    "kind": lambda series: {"kind": infer_dtype(series)},
+    "min": _scan,
+    "max": _scan,
+    "null_count": _scan,
+    "is_monotonic": _scan_monotonic,
+    "n_unique": lambda series: {"n_unique": _approx_n_unique(series)},
+    "digest": lambda series: {"digest": column_digest(series)},
+}
+
+
+class StatsCache:
+    """`ColumnStats` of the columns of a dataframe, kept by the accessor
+
+    stats of a column are reused across chart calls until the column is
+    replaced or modified.
+    """
+    def __init__(self, obj):
+        self._obj = obj
+        self._stats = {}
+        self._ranges = {}
+
+    def __getitem__(self, col):
+        series = self._obj[col]
+        stats = self._stats.get(col)
+        if stats is None or not stats.is_stats_of(series):
+            stats = self._stats[col] = ColumnStats(series)
+        return stats
+
+    def set_value_range(self, col, min_, max_):
+        """use (`min_`, `max_`) as the range of `col`, e.g. the range of
+        raw values of a column aggregated from chunks
+        """
+        self._ranges[col] = (min_, max_)
+
+    def _range(self, col):
+        if col in self._ranges:
+            return self._ranges[col]
+        stats = self[col]
+        return stats.min, stats.max
+
+    def value_range(self, columns):
+        """NaN-aware (min, max) over `columns`, used by visualMap"""
+        if not isinstance(columns, list):
+            columns = [columns]
+        ranges = [self._range(col) for col in columns]
+        mins = [r[0] for r in ranges if r[0] is not None]
+        maxs = [r[1] for r in ranges if r[1] is not None]
+        return (min(mins) if mins else None, max(maxs) if maxs else None)
+
+
+def stats_of(obj):
+    """`StatsCache` of a dataframe, or `ColumnStats` of a series
+
+    pandas creates a new accessor on every `df.echart`, so the stats are
+    kept on the pandas object itself, like older pandas cached accessors.
+    Without copy on write the stats of a column are recomputed on every
+    use, see `ColumnStats.is_stats_of`.
+    """
+    stats = obj.__dict__.get(_STATS_ATTR)
+    if isinstance(obj, pd.Series):
+        if stats is None or not stats.is_stats_of(obj):
+            # 保存一个视图，series被修改时copy on write会复制数据
+            stats = ColumnStats(obj[:])
+            object.__setattr__(obj, _STATS_ATTR, stats)
+    elif stats is None:
+        stats = StatsCache(obj)
+        object.__setattr__(obj, _STATS_ATTR, stats)
+    return stats
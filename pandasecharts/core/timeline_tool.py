@@ -0,0 +1,188 @@
+import json
+from simplejson import RawJSON
+
+
+_MISSING = object()
+# 不需要展开的基本类型，直接保留以减少递归调用
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (dict, list)) and a == b:
+        # 只含基本类型时直接比较，RawJSON等对象按值比较见下方
+        return True
+    if isinstance(a, dict):
+        return (len(a) == len(b)
+                and all(k in b and _same(v, b[k]) for k, v in a.items()))
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(map(_same, a, b))
+    if isinstance(a, RawJSON):
+        return a.encoded_json == b.encoded_json
+    if hasattr(a, "__dict__"):
+        # JsCode等对象
+        return _same(vars(a), vars(b))
+    return a == b
+
+
+def _plain(obj, opts_type):
+    """expand pyecharts opts into dicts and remove None values of dicts"""
+    if isinstance(obj, opts_type):
+        obj = obj.opts
+    if isinstance(obj, dict):
+        return {k: v if type(v) in _SCALAR_TYPES else _plain(v, opts_type)
+                for k, v in obj.items() if v is not None}
+    if isinstance(obj, (list, tuple)):
+        return [v if type(v) in _SCALAR_TYPES else _plain(v, opts_type)
+                for v in obj]
+    return obj
+
+
+def _factor_dicts(dicts, split_lists=False):
+    """split dicts into the part shared by all of them and the rest
+
+    ECharts merges timeline options into `baseOption` recursively for
+    dicts, and by position for component lists (e.g. `series`), other
+    lists are replaced as a whole, so lists are only split elementwise at
+    the top level (`split_lists=True`).
+
+    Returns:
+    ---
+        tuple: (common dict, list of remaining dicts)
+    """
+    common = {}
+    rests = [dict(d) for d in dicts]
+    keys = list(dicts[0])
+    for key in keys:
+        values = [d.get(key, _MISSING) for d in dicts]
+        if any(value is _MISSING for value in values):
+            continue
+        first = values[0]
+        if all(_same(first, value) for value in values[1:]):
+            common[key] = first
+            for rest in rests:
+                del rest[key]
+        elif all(isinstance(value, dict) for value in values):
+            sub_common, sub_rests = _factor_dicts(values)
+            if sub_common:
+                common[key] = sub_common
+                for rest, sub_rest in zip(rests, sub_rests):
+                    if sub_rest:
+                        rest[key] = sub_rest
+                    else:
+                        del rest[key]
+        elif (split_lists
+              and all(isinstance(value, list) and len(value) == len(first)
+                      and all(isinstance(item, dict) for item in value)
+                      for value in values)):
+            parts = [_factor_dicts([value[i] for value in values])
+                     for i in range(len(first))]
+            # 每个元素都有公共部分时才拆分，否则元素无法一一对应
+            if parts and all(part[0] for part in parts):
+                common[key] = [part[0] for part in parts]
+                for j, rest in enumerate(rests):
+                    rest[key] = [part[1][j] for part in parts]
+    return common, rests
+
+
+def _category_axis(frame, axis):
+    value = frame.get(axis)
+    if not isinstance(value, list) or len(value) != 1:
+        return None
+    value = value[0]
+    if value.get("type", "category") != "category":
+        return None
+    data = value.get("data")
+    return data if isinstance(data, list) else None
+
+
+def _load(data):
+    if isinstance(data, RawJSON):
+        return json.loads(data.encoded_json)
+    return data
+
+
+def _union_categories(frames, order):
+    """put the categories of every frame on one shared axis
+
+    `order` is the order of all categories on the shared axis, e.g. the
+    x values of the whole dataframe sorted before they were turned into
+    strings. Only done when every frame is a single category axis whose
+    categories follow `order`, and whose series data are values aligned
+    with them. Missing categories of a frame are filled by null.
+    """
+    positions = {value: i for i, value in enumerate(order)}
+    for axis in ("xAxis", "yAxis"):
+        categories = [_category_axis(frame, axis) for frame in frames]
+        if any(c is None for c in categories):
+            continue
+        if all(c == categories[0] for c in categories[1:]):
+            return
+        try:
+            index = [[positions[value] for value in cats]
+                     for cats in categories]
+        except (KeyError, TypeError):
+            return
+        # 每一帧的类目都要按order排列，否则合并后顺序会错
+        if any(ix != sorted(set(ix)) for ix in index):
+            return
+        used = sorted(set(i for ix in index for i in ix))
+        union = [order[i] for i in used]
+        shared = {i: j for j, i in enumerate(used)}
+        new_series = []
+        for frame, ix in zip(frames, index):
+            series_list = []
+            for series in frame.get("series", []):
+                data = _load(series.get("data"))
+                if (not isinstance(data, list) or len(data) != len(ix)
+                        or any(isinstance(v, (list, dict)) for v in data)):
+                    return
+                aligned = [None] * len(union)
+                for i, value in zip(ix, data):
+                    aligned[shared[i]] = value
+                series_list.append(dict(series, data=aligned))
+            new_series.append(series_list)
+        for frame, series_list in zip(frames, new_series):
+            frame[axis] = [dict(frame[axis][0], data=union)]
+            if series_list:
+                frame["series"] = series_list
+        return
+
+
+def factor_timeline(tl, axis_order=None):
+    """move options shared by every frame of a timeline into `baseOption`
+
+    pyecharts writes every option of every chart into its frame, and the
+    series of the last chart into `baseOption`. Here the frames are
+    compared, options equal in all frames, e.g. axis categories, legend,
+    series styles, are written once into `baseOption`, and each frame only
+    keeps what changes, e.g. series data and title.
+
+    Args:
+    ---
+        tl: pyecharts.charts.Timeline
+            a timeline whose charts are all added.
+        axis_order: list, optional. Defaults to None
+            all categories of the category axis in their display order.
+            If given, frames with different categories share one axis,
+            otherwise every frame keeps its own axis.
+    """
+    from pyecharts.options.series_options import BasicOpts
+
+    options = _plain(tl.options, BasicOpts)
+    base = options["baseOption"]
+    frames = options["options"]
+    if not frames:
+        return tl
+    if axis_order is not None:
+        _union_categories(frames, list(axis_order))
+    common, rests = _factor_dicts(frames, split_lists=True)
+    # 不在每一帧中的组件，例如timeline、grid和dataZoom，保持不变
+    new_base = {k: v for k, v in base.items()
+                if not all(k in frame for frame in frames)}
+    new_base.update(common)
+    tl.options = {"baseOption": new_base, "options": rests}
+    return tl
@@ -5,19 +5,49 @@ from .core.chart_tool import get_bar3d, get_line3d, get_scatter3d
 from .core.chart_tool import get_boxplot, get_funnel, get_geo, get_map
 from .core.chart_tool import get_calender, get_wordcloud
 from .core.chart_tool import timeline_decorator, by_decorator
-from .core.data_tool import infer_dtype, _categorize_array, to_datetime
+from .core.data_tool import infer_dtype, count_values, format_days
+from .core.data_tool import select_columns, sort_by, to_category
+from .core.data_tool import is_datetime, convert_columns
+from .core.cache_tool import cached, cached_aggregate
+from .core.stats_tool import stats_of
+from .core.profile_tool import profiled
 from .configs.chart_cfg import PieConfig, BarConfig, LineConfig, ScatterConfig
 from .configs.chart_cfg import Bar3DConfig, Line3DConfig, Scatter3DConfig
 from .configs.chart_cfg import BoxplotConfig, FunnelConfig, GeoConfig
 from .configs.chart_cfg import MapConfig, CalendarConfig, WordCloudConfig
+from .configs.chart_cfg import CALENDAR_TOP, CALENDAR_HEIGHT
 
 
 @pd.api.extensions.register_dataframe_accessor("echart")
 class DataFrameEcharts:
     def __init__(self, pandas_obj):
         self._obj = pandas_obj
+        self._stats = stats_of(pandas_obj)
+
+    def _aggregate(self, df, x, ys, agg_func, by, timeline, convert=None,
+                   resample=None):
+        """`cached_aggregate` of the unconverted columns `df` selected from
+        the accessor's data, keyed by the digests kept in `self._stats`
+
+        `convert` is applied before aggregating, and skipped on a hit.
+        """
+        return cached_aggregate(df, x, ys, agg_func, by, timeline,
+                                resample=resample, convert=convert,
+                                column_stats=self._stats.__getitem__)
+
+    def _resample(self, df, x, ys, rule, agg_func, by, timeline):
+        """bucket datetime `x` by `rule` within every (timeline, by) group
+
+        the result is sorted by x within every group.
+        """
+        if agg_func is None:
+            agg_func = "mean"
+        return self._aggregate(df, x, ys, agg_func, by, timeline,
+                               convert={x: "datetime"}, resample=rule)
 
     # TODO: 有没有可能by在timeline后面，即先timeiline，后by
+    @profiled
+    @cached
     def pie(self,
             x,
             y,
@@ -32,6 +62,7 @@ class DataFrameEcharts:
             rosetype=None,
             by=None,
             timeline=None,
+            n_jobs=None,
             init_opts=None,
             label_opts=None,
             title_opts=None,
@@ -72,6 +103,10 @@ class DataFrameEcharts:
                 pandas column name used to separate different groups.
             timeline: str, optional. Defaults to None
                 pandas column name for timeline.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             init_opts: dict, optional. Default to None
                 same as pyecharts init_opts.
             label_opts: dict, optional. Defaults to None
@@ -89,8 +124,12 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.pie.Pie: pie chart
         """
-        df = self._obj.copy()
-        df[x] = df[x].astype(str)
+        df = select_columns(self._obj, x, y, by, timeline)
+        if agg_func is not None:
+            df = self._aggregate(df, x, y, agg_func, by, timeline,
+                                 convert={x: "category"})
+        else:
+            df[x] = to_category(df[x], self._stats[x])
 
         pie_cfg = PieConfig()
         init_opts = pie_cfg.get_init_opts(init_opts, theme, figsize)
@@ -99,13 +138,14 @@ class DataFrameEcharts:
         legend_opts = pie_cfg.get_legend_opts(legend_opts)
         pie_opts = pie_cfg.get_pie_opts(pie_opts, center, radius, rosetype)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_pie))(
             df=df,
             x=x,
             y=y,
-            agg_func=agg_func,
+            agg_func=None,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -113,25 +153,32 @@ class DataFrameEcharts:
             pie_opts=pie_opts
         )
 
+    @profiled
+    @cached
     def bar(self,
             x,
             ys,
+            xtype=None,
             xaxis_name=None,
             yaxis_names="",
             title="",
             subtitle="",
             sort=None,
             agg_func=None,
+            resample=None,
             multiple_yaxis=False,
             stack_view=False,
             label_show=False,
             reverse_axis=False,
             datazoom=False,
             datazoom_type="slider",
+            use_dataset=False,
+            precision=None,
             figsize=None,
             theme=None,
             by=None,
             timeline=None,
+            n_jobs=None,
             init_opts=None,
             label_opts=None,
             title_opts=None,
@@ -149,6 +196,10 @@ class DataFrameEcharts:
                 pandas column name for x axis.
             ys: list of int or list of str
                 pandas column name for multiple y axis.
+            xtype: str, optional. Defaults to None
+                xaxis type, 'category' or 'time'. If None, 'time' for
+                datetime x, otherwise 'category'. x of 'time' is sent
+                as milliseconds since epoch.
             xaxis_name: str, optional. Defaults to None
                 xais name to show, If None, same as x.
             yaxis_name: str, optional. Defaults to ""
@@ -162,6 +213,10 @@ class DataFrameEcharts:
             agg_func: str, optional. Defaults to None
                 aggerate function name, e.g. "mean" "sum",
                 equals to `df.groupby(x)[y].agg(agg_func)`.
+            resample: str, optional. Defaults to None
+                pandas offset alias, e.g. "5min", "1D". If given, datetime
+                x is bucketed by this rule and `agg_func` (default "mean")
+                is applied to every bucket of every by/timeline group.
             multiple_yaxis: bool, optional. Defaults to False
                 if True, show multiple y axis separately.
             stack_view: bool, optional. Defaults to False
@@ -174,6 +229,12 @@ class DataFrameEcharts:
                 if True, show datazoom.
             datazoom_type: str, optional. Defaults to "slider"
                 datazoom type, "slider" or "inside".
+            use_dataset: bool, optional. Defaults to False
+                if True, put data into one columnar echarts dataset
+                shared by all series instead of one list per series.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of figure's width and height.
             theme: str, optional. Defaults to None
@@ -182,6 +243,10 @@ class DataFrameEcharts:
                 pandas column name used to separate different groups.
             timeline: str, optional. Defaults to None
                 pandas column name for timeline.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             init_opts: dict, optional. Default to None
                 same as pyecharts init_opts.
             label_opts: dict, optional. Defaults to None
@@ -206,12 +271,36 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.bar.Bar: bar chart
         """
-        df = self._obj.copy()
+        if not isinstance(ys, list):
+            ys = [ys]
+
+        df = select_columns(self._obj, x, ys, sort, by, timeline)
+        if resample is not None:
+            df = self._resample(df, x, ys, resample, agg_func, by, timeline)
+            agg_func = None
         # 由于dataframe的bar的x轴可以只考虑离散值，所以先按照
         # x排序，然后将x转为字符串类型，注意要在转str前排序，要不然
         # 会按照字典排序，从而造成数字排序很奇怪
-        df = df.sort_values(by=x)
-        df[x] = df[x].astype(str)
+        # 聚合时groupby的结果已经按x排好序，不需要对整个dataframe排序
+        if xtype is None:
+            xtype = "time" if is_datetime(df[x]) else "category"
+        convert = {x: "time" if xtype == "time" else "category"}
+        if agg_func is not None:
+            df = self._aggregate(df, x, ys, agg_func, by, timeline,
+                                 convert=convert)
+        elif resample is None:
+            df = sort_by(df, x, self._stats[x].is_monotonic)
+            convert_columns(df, convert, self._stats.__getitem__)
+        else:
+            # 重采样后的x已不是原始列，统计信息不再适用
+            convert_columns(df, convert)
+        # timeline各帧共用类目轴时的顺序，不聚合时dataframe已按x排好序，
+        # 聚合时groupby的结果按字符串排序
+        axis_order = None
+        if timeline is not None and xtype != "time":
+            axis_order = df[x].dropna().drop_duplicates().tolist()
+            if agg_func is not None or resample is not None:
+                axis_order.sort()
 
         if xaxis_name is None:
             xaxis_name = str(x)
@@ -219,9 +308,6 @@ class DataFrameEcharts:
         if not isinstance(yaxis_names, list):
             yaxis_names = [yaxis_names]*len(ys)
 
-        if not isinstance(ys, list):
-            ys = [ys]
-
         bar_cfg = BarConfig()
         init_opts = bar_cfg.get_init_opts(init_opts, theme, figsize)
         label_opts = bar_cfg.get_label_opts(label_opts, label_show,
@@ -229,24 +315,28 @@ class DataFrameEcharts:
         title_opts = bar_cfg.get_title_opts(title_opts, title, subtitle)
         legend_opts = bar_cfg.get_legend_opts(legend_opts)
         xaxis_opts = bar_cfg.get_xaxis_opts(xaxis_opts, xaxis_name,
-                                            multiple_yaxis)
+                                            multiple_yaxis, xtype)
         yaxis_opts = bar_cfg.get_yaxis_opts(yaxis_opts, yaxis_names[0])
         tooltip_opts = bar_cfg.get_tooltip_opts(tooltip_opts, multiple_yaxis)
         datazoom_opts = bar_cfg.get_datazoom_opts(datazoom_opts, datazoom,
                                                   datazoom_type)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs, axis_order=axis_order)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_bar))(
             df=df,
             x=x,
             ys=ys,
+            xtype=xtype,
             yaxis_names=yaxis_names,
             sort=sort,
-            agg_func=agg_func,
+            agg_func=None,
             multiple_yaxis=multiple_yaxis,
             stack_view=stack_view,
             reverse_axis=reverse_axis,
+            use_dataset=use_dataset,
+            precision=precision,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -257,6 +347,8 @@ class DataFrameEcharts:
             datazoom_opts=datazoom_opts
         )
 
+    @profiled
+    @cached
     def bar3d(self,
               x,
               y,
@@ -267,9 +359,11 @@ class DataFrameEcharts:
               title="",
               subtitle="",
               visualmap=False,
+              precision=None,
               figsize=None,
               theme=None,
               by=None,
+              n_jobs=None,
               init_opts=None,
               title_opts=None,
               visualmap_opts=None,
@@ -298,6 +392,9 @@ class DataFrameEcharts:
                 chart's subtitle to show.
             visualmap: bool, optional. Defaults to False
                 if True, show visualmap.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
@@ -306,6 +403,10 @@ class DataFrameEcharts:
                 pandas column name used to separate different groups.
             timeline: str, optional. Defaults to None
                 pandas column name for timeline.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             init_opts: dict, optional. Default to None
                 same as pyecharts init_opts.
             title_opts: dict, optional. Defaults to None
@@ -323,7 +424,7 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.three_axis_charts.bar3d.Bar3D: bar3d chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, y, z, by)
 
         if xaxis_name is None:
             xaxis_name = str(x)
@@ -338,21 +439,19 @@ class DataFrameEcharts:
         xaxis_opts = bar3d_cfg.get_xaxis_opts(xaxis_opts, xaxis_name)
         yaxis_opts = bar3d_cfg.get_yaxis_opts(yaxis_opts, yaxis_name)
         zaxis_opts = bar3d_cfg.get_zaxis_opts(zaxis_opts, zaxis_name)
-        min_ = df[z].values.min()
-        max_ = df[z].values.max()
-        min_ = min_.item() if hasattr(min_, 'item') else min_
-        max_ = max_.item() if hasattr(max_, 'item') else max_
+        min_, max_ = self._stats.value_range(z)
         visualmap_opts = bar3d_cfg.get_visualmap_opts(visualmap_opts,
                                                       min_,
                                                       max_)
 
-        bd = by_decorator(by=by)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return bd(get_bar3d)(
             df=df,
             x=x,
             y=y,
             z=z,
             visualmap=visualmap,
+            precision=precision,
             init_opts=init_opts,
             title_opts=title_opts,
             xaxis_opts=xaxis_opts,
@@ -361,6 +460,8 @@ class DataFrameEcharts:
             visualmap_opts=visualmap_opts,
         )
 
+    @profiled
+    @cached
     def line(self,
              x,
              ys,
@@ -370,15 +471,21 @@ class DataFrameEcharts:
              title="",
              subtitle="",
              agg_func=None,
+             resample=None,
              smooth=False,
              multiple_yaxis=False,
              label_show=False,
              datazoom=False,
              datazoom_type="slider",
+             downsample=None,
+             downsample_points=None,
+             use_dataset=False,
+             precision=None,
              figsize=None,
              theme=None,
              by=None,
              timeline=None,
+             n_jobs=None,
              init_opts=None,
              label_opts=None,
              title_opts=None,
@@ -397,7 +504,8 @@ class DataFrameEcharts:
             ys: list of int or list of str
                 pandas column names for multiple y axis.
             xtype: str, optional. Defaults to None
-                xaxis type, should be one of 'category', 'value'.
+                xaxis type, should be one of 'category', 'value', 'time'.
+                x of 'time' is sent as milliseconds since epoch.
             xaxis_name: str, optional. Defaults to None
                 xais name to show, If None, same as x.
             yaxis_names: str, optional. Defaults to ""
@@ -408,6 +516,10 @@ class DataFrameEcharts:
                 chart's subtitle to show.
             agg_func: str, optional. Defaults to None
                 aggregation function, e.g. 'sum', 'mean'.
+            resample: str, optional. Defaults to None
+                pandas offset alias, e.g. "5min", "1D". If given, datetime
+                x is bucketed by this rule and `agg_func` (default "mean")
+                is applied to every bucket of every by/timeline group.
             smooth: bool, optional. Defaults to False
                 if True, draw smooth line.
             multiple_yaxis: bool, optional. Defaults to False
@@ -418,6 +530,18 @@ class DataFrameEcharts:
                 if True, show datazoom.
             datazoom_type: str, optional. Defaults to "slider"
                 datazoom type, 'inside' or 'slider'.
+            downsample: str, optional. Defaults to None
+                downsample method for too many points, 'lttb' or
+                'minmax'. If None, all points are shown.
+            downsample_points: int, optional. Defaults to None
+                max points of each chart after downsampling,
+                If None, same as `options["downsample_points"]`.
+            use_dataset: bool, optional. Defaults to False
+                if True, put data into one columnar echarts dataset
+                shared by all series instead of one list per series.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
@@ -426,6 +550,10 @@ class DataFrameEcharts:
                 pandas column name used to separate different groups.
             timeline: str, optional. Defaults to None
                 pandas column name for timeline.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             init_opts: dict, optional. Default to None
                 same as pyecharts init_opts.
             label_opts: dict, optional. Defaults to None
@@ -449,7 +577,7 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.line.Line: line chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, ys, by, timeline)
         if xaxis_name is None:
             xaxis_name = x
 
@@ -459,16 +587,35 @@ class DataFrameEcharts:
         if not isinstance(ys, list):
             ys = [ys]
 
+        if resample is not None:
+            df = self._resample(df, x, ys, resample, agg_func, by, timeline)
+            agg_func = None
+
         if xtype is None:
-            xtype = infer_dtype(df[x])
+            if is_datetime(df[x]):
+                xtype = "time"
+            else:
+                xtype = self._stats[x].kind
             warnings.warn("Please specify argument xtype,"
                           f" \'{xtype}\' is infered!")
 
+        convert = {}
         if xtype == "category":
-            df[x] = df[x].astype(str)
-        # 如果xtype是value，需要排序，否则图形会变成非函数
-        elif xtype == "value":
-            df = df.sort_values(by=x)
+            convert[x] = "category"
+        elif xtype == "time":
+            convert[x] = "time"
+        if agg_func is not None:
+            df = self._aggregate(df, x, ys, agg_func, by, timeline,
+                                 convert=convert)
+        elif resample is None:
+            # 如果xtype是value，需要排序，否则图形会变成非函数，
+            # 聚合时groupby的结果已经按x排好序
+            if xtype in ("value", "time"):
+                df = sort_by(df, x, self._stats[x].is_monotonic)
+            convert_columns(df, convert, self._stats.__getitem__)
+        else:
+            # 重采样后的x已不是原始列，统计信息不再适用
+            convert_columns(df, convert)
 
         line_cfg = LineConfig()
         init_opts = line_cfg.get_init_opts(init_opts, theme, figsize)
@@ -481,16 +628,21 @@ class DataFrameEcharts:
         datazoom_opts = line_cfg.get_datazoom_opts(datazoom_opts, datazoom,
                                                    datazoom_type)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_line))(
             df=df,
             x=x,
             ys=ys,
             yaxis_names=yaxis_names,
-            agg_func=agg_func,
+            agg_func=None,
+            downsample=downsample,
+            downsample_points=downsample_points,
             smooth=smooth,
             multiple_yaxis=multiple_yaxis,
+            use_dataset=use_dataset,
+            precision=precision,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -501,6 +653,8 @@ class DataFrameEcharts:
             datazoom_opts=datazoom_opts
         )
 
+    @profiled
+    @cached
     def line3d(self,
                x,
                y,
@@ -514,9 +668,11 @@ class DataFrameEcharts:
                title="",
                subtitle="",
                visualmap=False,
+               precision=None,
                figsize=None,
                theme=None,
                by=None,
+               n_jobs=None,
                init_opts=None,
                title_opts=None,
                xaxis_opts=None,
@@ -551,12 +707,19 @@ class DataFrameEcharts:
                 chart's subtitle to show.
             visualmap: bool, optional. Defaults to False
                 if True, show visualmap.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             init_opts: dict, optional. Default to None
                 same as pyecharts init_opts.
             title_opts: dict, optional. Defaults to None
@@ -573,7 +736,7 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.three_axis_charts.line3d.Line3D: line3d chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, y, z, by)
         if xaxis_name is None:
             xaxis_name = str(x)
         if yaxis_name is None:
@@ -582,15 +745,15 @@ class DataFrameEcharts:
             zaxis_name = str(z)
 
         if xtype is None:
-            xtype = infer_dtype(df[x])
+            xtype = self._stats[x].kind
             warnings.warn("Please specify argument xtype,"
                           f" \'{xtype}\' is infered!")
         if ytype is None:
-            ytype = infer_dtype(df[y])
+            ytype = self._stats[y].kind
             warnings.warn("Please specify argument ytype"
                           f", \'{ytype}\' is infered!")
         if ztype is None:
-            ztype = infer_dtype(df[z])
+            ztype = self._stats[z].kind
             warnings.warn(f"Please specify argument ztype,"
                           f" \'{ztype}\' is infered!")
 
@@ -600,21 +763,19 @@ class DataFrameEcharts:
         xaxis_opts = line3d_cfg.get_xaxis_opts(xaxis_opts, xaxis_name, xtype)
         yaxis_opts = line3d_cfg.get_yaxis_opts(yaxis_opts, yaxis_name, ytype)
         zaxis_opts = line3d_cfg.get_zaxis_opts(zaxis_opts, zaxis_name, ztype)
-        min_ = df[z].values.min()
-        max_ = df[z].values.max()
-        min_ = min_.item() if hasattr(min_, "item") else min_
-        max_ = max_.item() if hasattr(max_, "item") else max_
+        min_, max_ = self._stats.value_range(z)
         visualmap_opts = line3d_cfg.get_visualmap_opts(visualmap_opts,
                                                        min_,
                                                        max_)
 
-        bd = by_decorator(by=by)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return bd(get_line3d)(
             df=df,
             x=x,
             y=y,
             z=z,
             visualmap=visualmap,
+            precision=precision,
             init_opts=init_opts,
             title_opts=title_opts,
             xaxis_opts=xaxis_opts,
@@ -623,6 +784,8 @@ class DataFrameEcharts:
             visualmap_opts=visualmap_opts
         )
 
+    @profiled
+    @cached
     def scatter(self,
                 x,
                 ys,
@@ -636,11 +799,16 @@ class DataFrameEcharts:
                 label_show=False,
                 datazoom=False,
                 datazoom_type="slider",
+                downsample=None,
+                downsample_points=None,
                 visualmap=False,
+                use_dataset=False,
+                precision=None,
                 figsize=None,
                 theme=None,
                 by=None,
                 timeline=None,
+                n_jobs=None,
                 init_opts=None,
                 label_opts=None,
                 title_opts=None,
@@ -659,7 +827,8 @@ class DataFrameEcharts:
             ys: list of int or list of str
                 pandas column names for multiple y axis.
             xtype: str, optional. Defaults to None
-                xaxis type, should be one of 'category', 'value'.
+                xaxis type, should be one of 'category', 'value', 'time'.
+                x of 'time' is sent as milliseconds since epoch.
             xaxis_name: str, optional. Defaults to None
                 xaxis name to show, If None, same as x.
             yaxis_names: str, optional. Defaults to ""
@@ -678,14 +847,30 @@ class DataFrameEcharts:
                 if True, show datazoom.
             datazoom_type: str, optional. Defaults to "slider"
                 datazoom type, 'inside' or 'slider'.
+            downsample: str, optional. Defaults to None
+                downsample method for too many points, 'lttb' or
+                'minmax'. If None, all points are shown.
+            downsample_points: int, optional. Defaults to None
+                max points of each chart after downsampling,
+                If None, same as `options["downsample_points"]`.
             visualmap: bool, optional. Defaults to False
                 if True, show visualmap.
+            use_dataset: bool, optional. Defaults to False
+                if True, put data into one columnar echarts dataset
+                shared by all series instead of one list per series.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to show timeline.
             init_opts: dict, optional. Default to None
@@ -711,18 +896,32 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.scatter.Scatter: scatter chart
         """
-        df = self._obj.copy()
-        df[x] = df[x].astype(str)
-
-        if xaxis_name is None:
-            xaxis_name = x
-
         if not isinstance(yaxis_names, list):
             yaxis_names = [yaxis_names]*len(ys)
 
         if not isinstance(ys, list):
             ys = [ys]
 
+        df = select_columns(self._obj, x, ys, by, timeline)
+        if xtype is None and is_datetime(df[x]):
+            xtype = "time"
+            warnings.warn("Please specify argument xtype,"
+                          f" \'{xtype}\' is infered!")
+        convert = {}
+        if xtype == "time":
+            convert[x] = "time"
+        # 数值型的x保持数值，降采样时才能按x的间隔选点
+        elif not (xtype == "value" and df[x].dtype.kind in "iuf"):
+            convert[x] = "category"
+        if agg_func is not None:
+            df = self._aggregate(df, x, ys, agg_func, by, timeline,
+                                 convert=convert)
+        else:
+            convert_columns(df, convert, self._stats.__getitem__)
+
+        if xaxis_name is None:
+            xaxis_name = x
+
         if xtype is None:
             xtype = infer_dtype(df[x])
             warnings.warn("Please specify argument xtype,"
@@ -737,25 +936,27 @@ class DataFrameEcharts:
         yaxis_opts = scatter_cfg.get_yaxis_opts(yaxis_opts, yaxis_names[0])
         datazoom_opts = scatter_cfg.get_datazoom_opts(datazoom_opts, datazoom,
                                                       datazoom_type)
-        min_ = df[ys].values.min()
-        max_ = df[ys].values.max()
-        min_ = min_.item() if hasattr(min_, "item") else min_
-        max_ = max_.item() if hasattr(max_, "item") else max_
+        min_, max_ = self._stats.value_range(ys)
         visualmap_opts = scatter_cfg.get_visualmap_opts(
                                                     visualmap_opts,
                                                     min_,
                                                     max_)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_scatter))(
             df=df,
             x=x,
             ys=ys,
             yaxis_names=yaxis_names,
-            agg_func=agg_func,
+            agg_func=None,
+            downsample=downsample,
+            downsample_points=downsample_points,
             multiple_yaxis=multiple_yaxis,
             visualmap=visualmap,
+            use_dataset=use_dataset,
+            precision=precision,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -766,6 +967,8 @@ class DataFrameEcharts:
             datazoom_opts=datazoom_opts,
         )
 
+    @profiled
+    @cached
     def scatter3d(self,
                   x,
                   y,
@@ -779,9 +982,11 @@ class DataFrameEcharts:
                   title="",
                   subtitle="",
                   visualmap=False,
+                  precision=None,
                   figsize=None,
                   theme=None,
                   by=None,
+                  n_jobs=None,
                   init_opts=None,
                   title_opts=None,
                   xaxis_opts=None,
@@ -816,12 +1021,19 @@ class DataFrameEcharts:
                 chart's subtitle to show.
             visualmap: bool, optional. Defaults to False
                 if True, show visualmap.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             init_opts: dict, optional. Default to None
                 same as pyecharts init_opts.
             title_opts: dict, optional. Default to None
@@ -840,7 +1052,7 @@ class DataFrameEcharts:
             pyecharts.charts.three_axis_charts.scatter3d.Scatter3D:
                 scatter3d chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, y, z, by)
         if xaxis_name is None:
             xaxis_name = str(x)
         if yaxis_name is None:
@@ -849,15 +1061,15 @@ class DataFrameEcharts:
             zaxis_name = str(z)
 
         if xtype is None:
-            xtype = infer_dtype(df[x])
+            xtype = self._stats[x].kind
             warnings.warn("Please specify argument xtype,"
                           f" \'{xtype}\' is infered!")
         if ytype is None:
-            ytype = infer_dtype(df[y])
+            ytype = self._stats[y].kind
             warnings.warn("Please specify argument ytype,"
                           f" \'{ytype}\' is infered!")
         if ztype is None:
-            ztype = infer_dtype(df[z])
+            ztype = self._stats[z].kind
             warnings.warn(f"Please specify argument ztype,"
                           f" \'{ztype}\' is infered!")
 
@@ -873,21 +1085,19 @@ class DataFrameEcharts:
         zaxis_opts = scatter3d_cfg.get_zaxis_opts(zaxis_opts,
                                                   zaxis_name,
                                                   ztype)
-        min_ = df[z].values.min()
-        max_ = df[z].values.max()
-        min_ = min_.item() if hasattr(min_, "item") else min_
-        max_ = max_.item() if hasattr(max_, "item") else max_
+        min_, max_ = self._stats.value_range(z)
         visualmap_opts = scatter3d_cfg.get_visualmap_opts(visualmap_opts,
                                                           min_,
                                                           max_)
 
-        bd = by_decorator(by=by)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return bd(get_scatter3d)(
             df=df,
             x=x,
             y=y,
             z=z,
             visualmap=visualmap,
+            precision=precision,
             init_opts=init_opts,
             title_opts=title_opts,
             xaxis_opts=xaxis_opts,
@@ -896,6 +1106,8 @@ class DataFrameEcharts:
             visualmap_opts=visualmap_opts
         )
 
+    @profiled
+    @cached
     def boxplot(self,
                 ys,
                 xaxis_name="",
@@ -908,6 +1120,7 @@ class DataFrameEcharts:
                 theme=None,
                 by=None,
                 timeline=None,
+                n_jobs=None,
                 init_opts=None,
                 title_opts=None,
                 legend_opts=None,
@@ -939,6 +1152,10 @@ class DataFrameEcharts:
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to create a timeline.
             init_opts: dict, optional. Default to None
@@ -961,7 +1178,7 @@ class DataFrameEcharts:
             pyecharts.charts.basic_charts.boxplot.Boxplot: boxplot chart
 
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, ys, by, timeline)
 
         if not isinstance(ys, list):
             ys = [ys]
@@ -975,8 +1192,9 @@ class DataFrameEcharts:
         datazoom_opts = boxplot_cfg.get_datazoom_opts(datazoom_opts, datazoom,
                                                       datazoom_type)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_boxplot))(
             df=df,
             ys=ys,
@@ -988,6 +1206,8 @@ class DataFrameEcharts:
             datazoom_opts=datazoom_opts,
         )
 
+    @profiled
+    @cached
     def funnel(self,
                x,
                y,
@@ -1000,6 +1220,7 @@ class DataFrameEcharts:
                theme=None,
                by=None,
                timeline=None,
+               n_jobs=None,
                init_opts=None,
                label_opts=None,
                title_opts=None,
@@ -1030,6 +1251,10 @@ class DataFrameEcharts:
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to create a timeline.
             init_opts: dict, optional. Default to None
@@ -1047,15 +1272,16 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.funnel.Funnel: funnel chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, y, by, timeline)
         funnel_cfg = FunnelConfig()
         init_opts = funnel_cfg.get_init_opts(init_opts, theme, figsize)
         title_opts = funnel_cfg.get_title_opts(title_opts, title, subtitle)
         label_opts = funnel_cfg.get_label_opts(label_opts, label_show,
                                                position)
         legend_opts = funnel_cfg.get_legend_opts(legend_opts)
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_funnel))(
             df=df,
             x=x,
@@ -1067,6 +1293,8 @@ class DataFrameEcharts:
             legend_opts=legend_opts,
         )
 
+    @profiled
+    @cached
     def geo(self,
             x,
             ys,
@@ -1080,6 +1308,7 @@ class DataFrameEcharts:
             theme=None,
             by=None,
             timeline=None,
+            n_jobs=None,
             init_opts=None,
             label_opts=None,
             title_opts=None,
@@ -1111,6 +1340,10 @@ class DataFrameEcharts:
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to create a timeline.
             init_opts: dict, optional. Default to None
@@ -1128,7 +1361,7 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.geo.Geo: geo chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, ys, by, timeline)
         if not isinstance(ys, list):
             ys = [ys]
 
@@ -1137,22 +1370,23 @@ class DataFrameEcharts:
         label_opts = geo_cfg.get_label_opts(label_opts, label_show)
         title_opts = geo_cfg.get_title_opts(title_opts, title, subtitle)
         # todo:
-        min_ = df[ys].values.min()
-        max_ = df[ys].values.max()
-        min_ = min_.item() if hasattr(min_, "item") else min_
-        max_ = max_.item() if hasattr(max_, "item") else max_
+        min_, max_ = self._stats.value_range(ys)
         visualmap_opts = geo_cfg.get_visualmap_opts(visualmap_opts,
                                                     min_,
                                                     max_)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        if agg_func is not None:
+            df = self._aggregate(df, x, ys, agg_func, by, timeline)
+
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_geo))(
             df=df,
             x=x,
             ys=ys,
             maptype=maptype,
-            agg_func=agg_func,
+            agg_func=None,
             visualmap=visualmap,
             init_opts=init_opts,
             label_opts=label_opts,
@@ -1160,6 +1394,8 @@ class DataFrameEcharts:
             visualmap_opts=visualmap_opts
         )
 
+    @profiled
+    @cached
     def map(self,
             x,
             y,
@@ -1173,6 +1409,7 @@ class DataFrameEcharts:
             theme=None,
             by=None,
             timeline=None,
+            n_jobs=None,
             init_opts=None,
             label_opts=None,
             title_opts=None,
@@ -1204,6 +1441,10 @@ class DataFrameEcharts:
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to create a timeline.
             init_opts: dict, optional. Default to None
@@ -1221,28 +1462,29 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.map.Map: map chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, y, by, timeline)
 
         map_cfg = MapConfig()
         init_opts = map_cfg.get_init_opts(init_opts, theme, figsize)
         label_opts = map_cfg.get_label_opts(label_opts, label_show)
         title_opts = map_cfg.get_title_opts(title_opts, title, subtitle)
-        min_ = df[y].values.min()
-        max_ = df[y].values.max()
-        min_ = min_.item() if hasattr(min_, "item") else min_
-        max_ = max_.item() if hasattr(max_, "item") else max_
+        min_, max_ = self._stats.value_range(y)
         visualmap_opts = map_cfg.get_visualmap_opts(visualmap_opts,
                                                     min_,
                                                     max_)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        if agg_func is not None:
+            df = self._aggregate(df, x, y, agg_func, by, timeline)
+
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_map))(
             df=df,
             x=x,
             y=y,
             maptype=maptype,
-            agg_func=agg_func,
+            agg_func=None,
             visualmap=visualmap,
             init_opts=init_opts,
             label_opts=label_opts,
@@ -1250,6 +1492,8 @@ class DataFrameEcharts:
             visualmap_opts=visualmap_opts,
         )
 
+    @profiled
+    @cached
     def calendar(self,
                  x,
                  y,
@@ -1258,10 +1502,12 @@ class DataFrameEcharts:
                  subtitle="",
                  agg_func=None,
                  visualmap=True,
+                 precision=None,
                  figsize=None,
                  theme=None,
                  by=None,
                  timeline=None,
+                 n_jobs=None,
                  init_opts=None,
                  title_opts=None,
                  visualmap_opts=None,
@@ -1277,20 +1523,29 @@ class DataFrameEcharts:
                 pandas column name for y axis.
             x_format: str, optional. Defaults to None
                 x axis time format, e.g. "%Y-%m-%d".
+                times are floored to days.
             title: str, optional. Defaults to ""
                 chart's title to show.
             subtitle: str, optional. Defaults to ""
                 chart's subtitle to show.
             agg_func: str, optional. Defaults to None
-                aggregation function, like "sum", "mean", "count".
+                aggregation function, like "sum", "mean", "count",
+                applied to the values of every day.
             visualmap: bool, optional. Defaults to True
                 if True, show visualmap.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to create a timeline.
             init_opts: dict, optional. Default to None
@@ -1300,7 +1555,8 @@ class DataFrameEcharts:
             visualmap_opts: dict, optional. Default to None
                 same as pyecharts visualmap_opts.
             calendar_opts: dict, optional. Default to None
-                same as pyecharts calendar_opts.
+                same as pyecharts calendar_opts, If `range_` isn't
+                given, a calendar is drawn for every year of x.
             timeline_opts: dict, optional. Default to None
                 same as pyecharts timeline_opts.
 
@@ -1308,38 +1564,48 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.calendar.Calendar: calendar chart
         """
-        df = self._obj.copy()
-
-        df[x] = to_datetime(df[x], format=x_format)
-        min_date, max_date = df[x].min(), df[x].max()
+        df = select_columns(self._obj, x, y, by, timeline)
+
+        # 只解析一次日期并按天取整，聚合和求最值都在整数上进行
+        convert = {x: ("days", x_format)}
+        if agg_func is not None:
+            df = self._aggregate(df, x, y, agg_func, by, timeline,
+                                 convert=convert)
+        else:
+            convert_columns(df, convert)
+        min_date, max_date = format_days([df[x].min(), df[x].max()])
         calendar_cfg = CalendarConfig()
         init_opts = calendar_cfg.get_init_opts(init_opts, theme, figsize)
         title_opts = calendar_cfg.get_title_opts(title_opts, title, subtitle)
-        min_ = df[y].values.min()
-        max_ = df[y].values.max()
-        min_ = min_.item() if hasattr(min_, "item") else min_
-        max_ = max_.item() if hasattr(max_, "item") else max_
+        min_, max_ = self._stats.value_range(y)
         visualmap_opts = calendar_cfg.get_visualmap_opts(visualmap_opts,
                                                          min_,
                                                          max_)
         calendar_opts = calendar_cfg.get_calendar_opts(calendar_opts,
                                                        min_date,
                                                        max_date)
+        if len(calendar_opts) > 1 and "height" not in init_opts:
+            height = CALENDAR_TOP + len(calendar_opts) * CALENDAR_HEIGHT
+            init_opts["height"] = f"{height}px"
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_calender))(
             df=df,
             x=x,
             y=y,
-            agg_func=agg_func,
+            agg_func=None,
             visualmap=visualmap,
+            precision=precision,
             init_opts=init_opts,
             title_opts=title_opts,
             visualmap_opts=visualmap_opts,
             calendar_opts=calendar_opts,
         )
 
+    @profiled
+    @cached
     def wordcloud(self,
                   x,
                   y,
@@ -1350,6 +1616,7 @@ class DataFrameEcharts:
                   theme=None,
                   by=None,
                   timeline=None,
+                  n_jobs=None,
                   init_opts=None,
                   title_opts=None,
                   tooltip_opts=None,
@@ -1374,6 +1641,10 @@ class DataFrameEcharts:
                 chart's theme, same as `pyecharts.globals.ThemeType`.
             by: str, optional. Defaults to None
                 pandas column name used to separate different groups.
+            n_jobs: int, optional. Defaults to None
+                number of processes used to build the charts of `by`
+                or `timeline` groups, -1 means using all cpus.
+                If None, same as `options["n_jobs"]`.
             timeline: str, optional. Defaults to None
                 pandas column name used to create a timeline.
             init_opts: dict, optional. Default to None
@@ -1389,20 +1660,24 @@ class DataFrameEcharts:
         ---
             pyecharts.charts.basic_charts.wordcloud.WordCloud: wordcloud chart
         """
-        df = self._obj.copy()
+        df = select_columns(self._obj, x, y, by, timeline)
 
         wordcloud_cfg = WordCloudConfig()
         init_opts = wordcloud_cfg.get_init_opts(init_opts, theme, figsize)
         title_opts = wordcloud_cfg.get_title_opts(title_opts, title, subtitle)
         tooltip_opts = wordcloud_cfg.get_tooltip_opts(tooltip_opts)
 
-        td = timeline_decorator(timeline, timeline_opts, init_opts)
-        bd = by_decorator(by=by)
+        if agg_func is not None:
+            df = self._aggregate(df, x, y, agg_func, by, timeline)
+
+        td = timeline_decorator(timeline, timeline_opts, init_opts,
+                                n_jobs=n_jobs)
+        bd = by_decorator(by=by, n_jobs=n_jobs)
         return td(bd(get_wordcloud))(
             df=df,
             x=x,
             y=y,
-            agg_func=agg_func,
+            agg_func=None,
             init_opts=init_opts,
             title_opts=title_opts,
             tooltip_opts=tooltip_opts,
@@ -1414,20 +1689,22 @@ class SeriesEcharts:
     def __init__(self, series_obj):
         self._obj = series_obj
 
+    def _column_stats(self):
+        return stats_of(self._obj)
+
     def _get_dist(self, dtype, bins):
-        df = self._obj.copy().to_frame()
-        xcol = df.columns[0]
+        xcol = 0 if self._obj.name is None else self._obj.name
 
         if dtype is None:
-            dtype = infer_dtype(df[xcol])
-        if dtype == "value":
-            df[xcol] = _categorize_array(df[xcol].values.tolist(), bins=bins)
-            df = df.sort_values(by=xcol)
+            dtype = self._column_stats().kind
+        labels, counts = count_values(self._obj.values, dtype, bins=bins)
 
         ycol = "count_" if xcol == "count" else "count"
-        df[ycol] = 1
+        df = pd.DataFrame({xcol: labels, ycol: counts})
         return df, xcol, ycol, dtype
 
+    @profiled
+    @cached
     def pie(self,
             xtype=None,
             bins=None,
@@ -1498,7 +1775,7 @@ class SeriesEcharts:
             df,
             xcol,
             ycol,
-            agg_func='sum',
+            agg_func=None,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -1506,6 +1783,8 @@ class SeriesEcharts:
             pie_opts=pie_opts,
         )
 
+    @profiled
+    @cached
     def bar(self,
             xtype=None,
             bins=None,
@@ -1518,6 +1797,7 @@ class SeriesEcharts:
             label_show=False,
             datazoom=False,
             datazoom_type="slider",
+            precision=None,
             figsize=None,
             theme=None,
             init_opts=None,
@@ -1555,6 +1835,9 @@ class SeriesEcharts:
                 show datazoom or not.
             datazoom_type: str, optional. Defaults to "slider"
                 datazoom type, "slider" or "inside".
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
@@ -1602,12 +1885,15 @@ class SeriesEcharts:
             df,
             xcol,
             [ycol],
+            xtype="category",
             yaxis_names=[yaxis_name],
             sort=sort,
-            agg_func='sum',
+            agg_func=None,
             multiple_yaxis=False,
             stack_view=False,
             reverse_axis=reverse_axis,
+            use_dataset=False,
+            precision=precision,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -1618,6 +1904,8 @@ class SeriesEcharts:
             datazoom_opts=datazoom_opts,
         )
 
+    @profiled
+    @cached
     def line(self,
              xtype=None,
              bins=None,
@@ -1629,6 +1917,9 @@ class SeriesEcharts:
              label_show=False,
              datazoom=False,
              datazoom_type="slider",
+             downsample=None,
+             downsample_points=None,
+             precision=None,
              figsize=None,
              theme=None,
              init_opts=None,
@@ -1663,6 +1954,15 @@ class SeriesEcharts:
                 show datazoom or not.
             datazoom_type: str, optional. Defaults to "slider"
                 datazoom type, "slider" or "inside".
+            downsample: str, optional. Defaults to None
+                downsample method for too many points, 'lttb' or
+                'minmax'. If None, all points are shown.
+            downsample_points: int, optional. Defaults to None
+                max points of each chart after downsampling,
+                If None, same as `options["downsample_points"]`.
+            precision: int, optional. Defaults to None
+                number of decimals kept for float values of chart data.
+                If None, same as `options["precision"]`.
             figsize: tuple, optional. Defaults to None
                 a tuple of chart's width and height.
             theme: str, optional. Defaults to None
@@ -1710,8 +2010,12 @@ class SeriesEcharts:
             [ycol],
             multiple_yaxis=False,
             yaxis_names=[yaxis_name],
-            agg_func="sum",
+            agg_func=None,
+            downsample=downsample,
+            downsample_points=downsample_points,
             smooth=smooth,
+            use_dataset=False,
+            precision=precision,
             init_opts=init_opts,
             label_opts=label_opts,
             title_opts=title_opts,
@@ -1722,6 +2026,8 @@ class SeriesEcharts:
             datazoom_opts=datazoom_opts,
         )
 
+    @profiled
+    @cached
     def boxplot(self,
                 xaxis_name=None,
                 yaxis_name="",
@@ -1797,6 +2103,8 @@ class SeriesEcharts:
             datazoom_opts=datazoom_opts,
         )
 
+    @profiled
+    @cached
     def geo(self,
             maptype,
             title="",
@@ -1858,7 +2166,7 @@ class SeriesEcharts:
             xcol,
             [ycol],
             maptype=maptype,
-            agg_func='sum',
+            agg_func=None,
             visualmap=visualmap,
             init_opts=init_opts,
             label_opts=label_opts,
@@ -1866,6 +2174,8 @@ class SeriesEcharts:
             visualmap_opts=visualmap_opts
         )
 
+    @profiled
+    @cached
     def map(self,
             maptype,
             title="",
@@ -1927,7 +2237,7 @@ class SeriesEcharts:
             xcol,
             ycol,
             maptype=maptype,
-            agg_func='sum',
+            agg_func=None,
             visualmap=visualmap,
             init_opts=init_opts,
             label_opts=label_opts,
@@ -0,0 +1,228 @@
+from .echart import DataFrameEcharts
+from .core.data_tool import aggregate_chunks, to_days
+from .core.stats_tool import ColumnStats
+
+
+# 分块聚合后每个key只剩一行，再用这些函数交给DataFrameEcharts聚合一次，
+# 可以保持和一次性聚合相同的x排序和类型转换
+_FINAL_AGG_FUNCS = {
+    "sum": "sum",
+    "count": "sum",
+    "mean": "mean",
+    "min": "min",
+    "max": "max",
+}
+
+
+class StreamEcharts:
+    """build charts from an iterator of dataframe chunks
+
+    e.g. `StreamEcharts(pd.read_csv(path, chunksize=100000)).bar(...)`,
+    chunks are aggregated one by one by `(timeline, by, x)`, so memory is
+    bounded by the number of distinct keys rather than the number of rows.
+    `agg_func` must be one of "sum", "count", "mean", "min", "max".
+
+    An iterator can only be consumed once, so each chart needs a new
+    `StreamEcharts` unless `chunks` is a re-iterable like a list.
+    visualmap ranges come from the raw values of every chunk, same as
+    `DataFrameEcharts` on the whole data.
+    """
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._consumed = False
+
+    def _aggregate(self, x, ys, agg_func, by, timeline, convert=None):
+        if self._consumed:
+            raise RuntimeError("chunks have already been consumed, "
+                               "please create a new StreamEcharts")
+        if iter(self._chunks) is self._chunks:
+            self._consumed = True
+        columns = ys if isinstance(ys, list) else [ys]
+        ranges = {y: [] for y in columns}
+
+        def convert_chunk(chunk):
+            if convert is not None:
+                chunk = convert(chunk)
+            # 记录原始值的范围，聚合后visualmap的范围仍和一次性读入时一致
+            for y in columns:
+                stats = ColumnStats(chunk[y])
+                ranges[y].append((stats.min, stats.max))
+            return chunk
+
+        df = aggregate_chunks(self._chunks, x, ys, agg_func, by=by,
+                              timeline=timeline, convert=convert_chunk)
+        dfe = DataFrameEcharts(df)
+        for y, values in ranges.items():
+            mins = [v[0] for v in values if v[0] is not None]
+            maxs = [v[1] for v in values if v[1] is not None]
+            dfe._stats.set_value_range(y, min(mins) if mins else None,
+                                       max(maxs) if maxs else None)
+        return dfe
+
+    def pie(self, x, y, agg_func="sum", by=None, timeline=None, **kwargs):
+        """pie chart
+
+        Args:
+        ---
+            x: int, str
+                pandas column name for `x` axis.
+            y: int, str
+                pandas column name for `y` axis.
+            agg_func: str, optional. Defaults to "sum"
+                one of "sum", "count", "mean", "min", "max".
+            by: str, optional. Defaults to None
+                pandas column name used to separate different groups.
+            timeline: str, optional. Defaults to None
+                pandas column name for timeline.
+            kwargs:
+                other arguments of `DataFrameEcharts.pie`.
+
+        Returns:
+        ---
+            pyecharts.charts.basic_charts.pie.Pie: pie chart
+        """
+        dfe = self._aggregate(x, y, agg_func, by, timeline)
+        return dfe.pie(x, y, agg_func=_FINAL_AGG_FUNCS[agg_func], by=by,
+                       timeline=timeline, **kwargs)
+
+    def bar(self, x, ys, agg_func="sum", by=None, timeline=None, **kwargs):
+        """bar chart
+
+        Args:
+        ---
+            x: int or str
+                pandas column name for x axis.
+            ys: list of int or list of str
+                pandas column name for multiple y axis.
+            agg_func: str, optional. Defaults to "sum"
+                one of "sum", "count", "mean", "min", "max".
+            by: str, optional. Defaults to None
+                pandas column name used to separate different groups.
+            timeline: str, optional. Defaults to None
+                pandas column name for timeline.
+            kwargs:
+                other arguments of `DataFrameEcharts.bar`.
+
+        Returns:
+        ---
+            pyecharts.charts.basic_charts.bar.Bar: bar chart
+        """
+        if not isinstance(ys, list):
+            ys = [ys]
+        dfe = self._aggregate(x, ys, agg_func, by, timeline)
+        return dfe.bar(x, ys, agg_func=_FINAL_AGG_FUNCS[agg_func], by=by,
+                       timeline=timeline, **kwargs)
+
+    def line(self, x, ys, agg_func="sum", by=None, timeline=None, **kwargs):
+        """line chart
+
+        Args:
+        ---
+            x: int or str
+                pandas column name for x axis.
+            ys: list of int or list of str
+                pandas column names for multiple y axis.
+            agg_func: str, optional. Defaults to "sum"
+                one of "sum", "count", "mean", "min", "max".
+            by: str, optional. Defaults to None
+                pandas column name used to separate different groups.
+            timeline: str, optional. Defaults to None
+                pandas column name for timeline.
+            kwargs:
+                other arguments of `DataFrameEcharts.line`.
+
+        Returns:
+        ---
+            pyecharts.charts.basic_charts.line.Line: line chart
+        """
+        if not isinstance(ys, list):
+            ys = [ys]
+        dfe = self._aggregate(x, ys, agg_func, by, timeline)
+        return dfe.line(x, ys, agg_func=_FINAL_AGG_FUNCS[agg_func], by=by,
+                        timeline=timeline, **kwargs)
+
+    def funnel(self, x, y, agg_func="sum", by=None, timeline=None,
+               **kwargs):
+        """funnel chart
+
+        Args:
+        ---
+            x: int, str
+                pandas column name for x axis.
+            y: int, str
+                pandas column name for y axis.
+            agg_func: str, optional. Defaults to "sum"
+                one of "sum", "count", "mean", "min", "max".
+            by: str, optional. Defaults to None
+                pandas column name used to separate different groups.
+            timeline: str, optional. Defaults to None
+                pandas column name for timeline.
+            kwargs:
+                other arguments of `DataFrameEcharts.funnel`.
+
+        Returns:
+        ---
+            pyecharts.charts.basic_charts.funnel.Funnel: funnel chart
+        """
+        dfe = self._aggregate(x, y, agg_func, by, timeline)
+        return dfe.funnel(x, y, by=by, timeline=timeline, **kwargs)
+
+    def map(self, x, y, agg_func="sum", by=None, timeline=None, **kwargs):
+        """map chart
+
+        Args:
+        ---
+            x: int, str
+                pandas column name for x axis.
+            y: int, str
+                pandas column name for y axis.
+            agg_func: str, optional. Defaults to "sum"
+                one of "sum", "count", "mean", "min", "max".
+            by: str, optional. Defaults to None
+                pandas column name used to separate different groups.
+            timeline: str, optional. Defaults to None
+                pandas column name for timeline.
+            kwargs:
+                other arguments of `DataFrameEcharts.map`.
+
+        Returns:
+        ---
+            pyecharts.charts.basic_charts.map.Map: map chart
+        """
+        dfe = self._aggregate(x, y, agg_func, by, timeline)
+        return dfe.map(x, y, agg_func=_FINAL_AGG_FUNCS[agg_func], by=by,
+                       timeline=timeline, **kwargs)
+
+    def calendar(self, x, y, x_format=None, agg_func="sum", by=None,
+                 timeline=None, **kwargs):
+        """calendar chart
+
+        Args:
+        ---
+            x: int, str
+                pandas column name for x axis.
+            y: int, str
+                pandas column name for y axis.
+            x_format: str, optional. Defaults to None
+                x axis time format, e.g. "%Y-%m-%d".
+            agg_func: str, optional. Defaults to "sum"
+                one of "sum", "count", "mean", "min", "max".
+            by: str, optional. Defaults to None
+                pandas column name used to separate different groups.
+            timeline: str, optional. Defaults to None
+                pandas column name for timeline.
+            kwargs:
+                other arguments of `DataFrameEcharts.calendar`.
+
+        Returns:
+        ---
+            pyecharts.charts.basic_charts.calendar.Calendar: calendar chart
+        """
+        def convert(chunk):
+            # 按天聚合，中间结果中每天只有一行
+            chunk[x] = to_days(chunk[x], format=x_format)
+            return chunk
+
+        dfe = self._aggregate(x, y, agg_func, by, timeline, convert=convert)
+        return dfe.calendar(x, y, agg_func=_FINAL_AGG_FUNCS[agg_func], by=by,
+                            timeline=timeline, **kwargs)
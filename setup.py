@@ -148,7 +148,8 @@ setup(
     # https://packaging.python.org/discussions/install-requires-vs-requirements/
     install_requires=[
         'pandas',
-        'pyecharts>=1.0.0'],  # Optional
+        'pyecharts>=1.0.0',
+        'simplejson'],  # Optional
 
     # List additional groups of dependencies here (e.g. development
     # dependencies). Users will be able to install these using the "extras"
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandasecharts  # noqa: F401
+from pandasecharts import echart  # noqa: F401
+from pandasecharts.configs.basic_cfg import options
+from pandasecharts.core.cache_tool import clear_cache
+
+
+@pytest.fixture(autouse=True)
+def restore_options():
+    """every test starts with the default options and empty caches"""
+    saved = dict(options)
+    clear_cache()
+    yield
+    options.clear()
+    options.update(saved)
+    clear_cache()
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 400
+    return pd.DataFrame({
+        "x": rng.integers(0, 12, n),
+        "cat": rng.choice(list("abcde"), n),
+        "y1": rng.random(n).round(3),
+        "y2": rng.integers(0, 100, n),
+        "g": rng.choice(["g1", "g2", "g3"], n),
+        "t": rng.choice([2019, 2020, 2021], n),
+    })
@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasecharts import cache_info
+from pandasecharts.configs.basic_cfg import options
+from pandasecharts.core import cache_tool
+
+
+@pytest.fixture(autouse=True)
+def agg_cache_on():
+    options["agg_cache_size"] = 8
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """count the conversions and aggregations actually run"""
+    calls = {"convert": 0, "aggregate": 0}
+
+    def counting(name, func):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(cache_tool, "convert_columns",
+                        counting("convert", cache_tool.convert_columns))
+    monkeypatch.setattr(cache_tool, "aggregate",
+                        counting("aggregate", cache_tool.aggregate))
+    return calls
+
+
+def _series(chart):
+    return json.loads(chart.dump_options())["series"]
+
+
+def test_restyling_reuses_the_aggregate(df, calls):
+    first = df.echart.bar("x", ["y1", "y2"], agg_func="mean", by="g")
+    second = df.echart.bar("x", ["y1", "y2"], agg_func="mean", by="g",
+                           title="restyled", theme="dark")
+    assert calls == {"convert": 1, "aggregate": 1}
+    assert cache_info("agg")["hits"] == 1
+    assert len(first._charts) == len(second._charts) == 3
+    for a, b in zip(first._charts, second._charts):
+        assert _series(b) == _series(a)
+
+
+def test_different_aggregation_misses(df, calls):
+    df.echart.bar("x", "y1", agg_func="mean")
+    df.echart.bar("x", "y1", agg_func="sum")
+    df.echart.bar("x", "y2", agg_func="sum")
+    assert calls["aggregate"] == 3
+    assert cache_info("agg")["hits"] == 0
+
+
+def test_write_to_the_frame_invalidates(df, calls):
+    before = _series(df.echart.bar("cat", "y2", agg_func="sum"))
+    df.loc[df["cat"] == "a", "y2"] = 0
+    after = _series(df.echart.bar("cat", "y2", agg_func="sum"))
+    assert calls["aggregate"] == 2
+    assert after[0]["data"][0] == 0 != before[0]["data"][0]
+
+
+def test_cached_result_is_not_changed_by_callers(df):
+    first = cache_tool.cached_aggregate(df, "cat", ["y1"], "sum")
+    first["y1"] = 0
+    second = cache_tool.cached_aggregate(df, "cat", ["y1"], "sum")
+    assert (second["y1"] != 0).all()
+
+
+def test_calendar_converts_dates_once(calls):
+    dates = pd.date_range("2021-01-01", periods=60).strftime("%Y%m%d")
+    df = pd.DataFrame({"date": np.repeat(dates, 3),
+                       "v": np.arange(180)})
+    first = df.echart.calendar("date", "v", x_format="%Y%m%d",
+                               agg_func="sum")
+    second = df.echart.calendar("date", "v", x_format="%Y%m%d",
+                                agg_func="sum", title="restyled")
+    assert calls == {"convert": 1, "aggregate": 1}
+    data = _series(second)[0]["data"]
+    assert data == _series(first)[0]["data"]
+    assert data[0] == ["2021-01-01", 0 + 1 + 2]
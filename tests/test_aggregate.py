@@ -0,0 +1,43 @@
+import json
+
+import pandas as pd
+import pandas.testing as tm
+
+from pandasecharts.core.data_tool import aggregate
+
+
+def test_aggregate_matches_groupby_of_every_group(df):
+    result = aggregate(df, "x", ["y1", "y2"], "sum", by="g", timeline="t")
+    for (t, g), part in df.groupby(["t", "g"]):
+        expected = part.groupby("x")[["y1", "y2"]].sum().reset_index()
+        got = result[(result["t"] == t) & (result["g"] == g)]
+        tm.assert_frame_equal(got[["x", "y1", "y2"]].reset_index(drop=True),
+                              expected)
+
+
+def test_aggregate_by_column_that_is_also_a_y():
+    df = pd.DataFrame({"x": list("abab"), "g": [1, 1, 2, 2]})
+    result = aggregate(df, "x", ["g"], "sum", by="g")
+    assert result.index.names == ["g"]
+    assert result.reset_index(drop=True)["g"].tolist() == [1, 1, 2, 2]
+
+    page = df.echart.bar("x", "g", by="g", agg_func="sum")
+    data = [json.loads(chart.dump_options())["series"][0]["data"]
+            for chart in page]
+    assert data == [[1, 1], [2, 2]]
+
+
+def test_timeline_frames_use_the_aggregate_of_their_group(df):
+    tl = df.echart.bar("x", ["y2"], agg_func="sum", timeline="t")
+    options = json.loads(tl.dump_options())
+    frames = options["options"]
+    assert len(frames) == df["t"].nunique()
+    for frame, (_, part) in zip(frames, df.groupby("t")):
+        expected = part.groupby("x")["y2"].sum()
+        # 共用的类目轴在baseOption中
+        axis = frame.get("xAxis") or options["baseOption"]["xAxis"]
+        categories = axis[0]["data"]
+        data = frame["series"][0]["data"]
+        values = dict(zip(categories, data))
+        assert {k: v for k, v in values.items() if v is not None} == {
+            str(k): v for k, v in expected.items()}
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from pyecharts import options as opts
+
+from pandasecharts import cache_info, clear_cache
+from pandasecharts.configs.basic_cfg import options
+
+
+@pytest.fixture(autouse=True)
+def chart_cache_on():
+    options["cache_size"] = 4
+
+
+def _bar(df, **kwargs):
+    return df.echart.bar("cat", "y1", agg_func="sum", **kwargs)
+
+
+def test_same_call_hits_the_cache(df):
+    first = _bar(df)
+    second = _bar(df)
+    info = cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (1, 1, 1)
+    assert second.dump_options() == first.dump_options()
+
+
+def test_disabled_cache_is_not_used(df):
+    options["cache_size"] = 0
+    _bar(df)
+    _bar(df)
+    assert cache_info()["size"] == 0
+
+
+def test_cached_charts_are_independent_copies(df):
+    first = _bar(df)
+    first.set_global_opts(title_opts=opts.TitleOpts(title="changed"))
+    second = _bar(df)
+    assert second is not first
+    assert "changed" not in second.dump_options()
+    assert len({first.chart_id, second.chart_id, _bar(df).chart_id}) == 3
+
+
+def test_arguments_and_options_are_part_of_the_key(df):
+    _bar(df)
+    _bar(df, title="other")
+    options["precision"] = 1
+    _bar(df)
+    assert cache_info()["misses"] == 3
+
+
+def test_changed_data_is_not_served_from_the_cache(df):
+    before = json.loads(_bar(df).dump_options())["series"][0]["data"]
+    df.loc[df["cat"] == "a", "y1"] += 1
+    after = json.loads(_bar(df).dump_options())["series"][0]["data"]
+    assert cache_info()["hits"] == 0
+    assert after[0] == pytest.approx(before[0] + (df["cat"] == "a").sum())
+
+
+def test_unreferenced_columns_dont_change_the_key(df):
+    _bar(df)
+    df["y2"] = 0
+    _bar(df)
+    assert cache_info()["hits"] == 1
+
+
+def test_lru_eviction(df):
+    options["cache_size"] = 2
+    for title in ("a", "b", "c"):
+        _bar(df, title=title)
+    _bar(df, title="a")
+    info = cache_info()
+    assert (info["size"], info["evictions"], info["hits"]) == (2, 2, 0)
+
+
+def test_clear_cache(df):
+    _bar(df)
+    clear_cache("chart")
+    assert cache_info() == {"hits": 0, "misses": 0, "evictions": 0,
+                            "size": 0, "nbytes": 0}
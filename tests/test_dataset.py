@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+
+def _options(chart):
+    return json.loads(chart.dump_options())
+
+
+@pytest.mark.parametrize("method", ["bar", "line", "scatter"])
+def test_dataset_holds_every_column_once(df, method):
+    kwargs = {} if method == "bar" else {"xtype": "category"}
+    plain = _options(getattr(df.echart, method)(
+        "x", ["y1", "y2"], agg_func="sum", **kwargs))
+    result = _options(getattr(df.echart, method)(
+        "x", ["y1", "y2"], agg_func="sum", use_dataset=True, **kwargs))
+
+    source = result["dataset"][0]["source"]
+    assert list(source) == ["x", "y1", "y2"]
+    assert [str(v) for v in source["x"]] == [
+        str(v) for v in plain["xAxis"][0]["data"]]
+    for series, expected, y in zip(result["series"], plain["series"],
+                                   ["y1", "y2"]):
+        assert series["encode"] == {"x": "x", "y": y}
+        assert not series.get("data")
+        values = [v[1] if isinstance(v, list) else v
+                  for v in expected["data"]]
+        assert source[y] == pytest.approx(values)
+
+
+def test_dataset_encode_follows_reverse_axis(df):
+    result = _options(df.echart.bar("cat", ["y1", "y2"], agg_func="sum",
+                                    use_dataset=True, reverse_axis=True))
+    assert [s["encode"] for s in result["series"]] == [
+        {"x": "y1", "y": "cat"}, {"x": "y2", "y": "cat"}]
+
+
+def test_dataset_uses_precision(df):
+    result = _options(df.echart.bar("cat", "y1", agg_func="mean",
+                                    use_dataset=True, precision=1))
+    expected = df.groupby("cat")["y1"].mean().round(1).tolist()
+    assert result["dataset"][0]["source"]["y1"] == expected
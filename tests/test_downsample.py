@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasecharts.core.data_tool import (_lttb_indices, _minmax_indices,
+                                          downsample)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(1)
+    n = 1000
+    return np.arange(n, dtype=float), rng.normal(size=n).cumsum()
+
+
+@pytest.mark.parametrize("func", [_lttb_indices, _minmax_indices])
+@pytest.mark.parametrize("n_out", [0, 1, 2, 3, 4, 5, 10, 101, 999])
+def test_indices_stay_within_budget(series, func, n_out):
+    x, y = series
+    indices = func(x, y, n_out)
+    assert len(indices) <= n_out
+    assert len(np.unique(indices)) == len(indices)
+    if n_out >= 2:
+        assert indices[0] == 0 and indices[-1] == len(y) - 1
+
+
+@pytest.mark.parametrize("func", [_lttb_indices, _minmax_indices])
+def test_budget_larger_than_data_keeps_everything(series, func):
+    x, y = series
+    np.testing.assert_array_equal(func(x, y, len(y)), np.arange(len(y)))
+
+
+def test_minmax_keeps_global_extremes(series):
+    x, y = series
+    indices = _minmax_indices(x, y, 50)
+    assert np.argmin(y) in indices and np.argmax(y) in indices
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("n_points", [1, 2, 5, 100])
+def test_downsample_splits_budget_among_ys(method, n_points):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"x": np.arange(5000), "a": rng.random(5000),
+                       "b": rng.random(5000)})
+    result = downsample(df, "x", ["a", "b"], method, n_points)
+    assert len(result) <= n_points
+    assert result["x"].is_monotonic_increasing
+
+
+def test_downsample_skips_nan(series):
+    x, y = series
+    y = y.copy()
+    y[::3] = np.nan
+    df = pd.DataFrame({"x": x, "y": y})
+    result = downsample(df, "x", ["y"], "lttb", 100)
+    assert result["y"].notna().all()
+
+
+def test_downsample_rejects_unknown_method(df):
+    with pytest.raises(ValueError):
+        downsample(df, "x", ["y1"], "random", 10)
+
+
+def test_line_downsample_option(series):
+    x, y = series
+    df = pd.DataFrame({"x": x, "y": y})
+    chart = df.echart.line("x", ["y"], xtype="value", downsample="minmax",
+                           downsample_points=100)
+    data = json.loads(chart.dump_options())["series"][0]["data"]
+    assert 2 <= len(data) <= 100
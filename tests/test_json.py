@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+import pandas as pd
+from simplejson import RawJSON
+
+from pandasecharts.configs.basic_cfg import options
+from pandasecharts.core.json_tool import SMALL_DATA_SIZE, to_json_data
+
+
+def _decode(result):
+    if isinstance(result, RawJSON):
+        return json.loads(result.encoded_json)
+    return result
+
+
+def _big_frame(n=SMALL_DATA_SIZE):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"x": np.arange(n), "y": rng.random(n)})
+
+
+def test_small_data_is_a_list():
+    result = to_json_data(pd.Series([1.5, 2.0, 3.25]))
+    assert result == [1.5, 2.0, 3.25]
+
+
+def test_large_numeric_data_is_compact_json():
+    data = pd.DataFrame({"x": np.arange(SMALL_DATA_SIZE),
+                         "y": np.arange(SMALL_DATA_SIZE, dtype=float)})
+    result = to_json_data(data)
+    assert isinstance(result, RawJSON)
+    assert " " not in result.encoded_json
+    assert _decode(result) == data.values.tolist()
+
+
+def test_full_precision_keeps_every_float():
+    data = _big_frame()
+    result = to_json_data(data)
+    assert isinstance(result, RawJSON)
+    assert " " not in result.encoded_json
+    decoded = _decode(result)
+    assert [row[1] for row in decoded] == data["y"].tolist()
+    assert all(isinstance(row[0], int) for row in decoded)
+
+
+def test_missing_and_infinite_values_become_null():
+    data = _big_frame()
+    data.loc[3, "y"] = np.nan
+    data.loc[5, "y"] = np.inf
+    data.loc[7, "y"] = -np.inf
+    decoded = _decode(to_json_data(data))
+    assert [decoded[i][1] for i in (3, 5, 7)] == [None, None, None]
+    assert decoded[4][1] == data.loc[4, "y"]
+
+
+def test_precision_rounds_floats():
+    data = _big_frame()
+    for result in (to_json_data(data, precision=2),
+                   to_json_data(data.head(10), precision=2)):
+        values = [row[1] for row in _decode(result)]
+        assert values == data["y"].head(len(values)).round(2).tolist()
+
+
+def test_precision_option_is_the_default():
+    options["precision"] = 1
+    decoded = _decode(to_json_data(_big_frame()))
+    assert decoded[0][1] == round(_big_frame()["y"][0], 1)
+
+
+def test_strings_and_objects():
+    n = SMALL_DATA_SIZE + 1
+    strings = pd.Series(["a\"b", "中文"] * n, dtype="string")
+    assert _decode(to_json_data(strings)) == strings.tolist()
+    objects = pd.Series([{"a": 1}] * n, dtype=object)
+    assert to_json_data(objects) == objects.tolist()
+
+
+def test_as_list_returns_python_lists():
+    data = _big_frame()
+    result = to_json_data(data, precision=3, as_list=True)
+    assert isinstance(result, list)
+    assert result[0] == [0, round(data["y"][0], 3)]
+
+
+def test_item_charts_use_the_precision_option():
+    options["precision"] = 2
+    df = pd.DataFrame({"name": ["a", "b"], "value": [1.23456, 2.34567]})
+    for chart in (df.echart.pie("name", "value"),
+                  df.echart.funnel("name", "value")):
+        data = json.loads(chart.dump_options())["series"][0]["data"]
+        assert [item["value"] for item in data] == [1.23, 2.35]
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasecharts.core.data_tool import to_epoch_ms
+
+
+@pytest.fixture
+def ts():
+    rng = np.random.default_rng(0)
+    n = 500
+    seconds = rng.integers(0, 3 * 86400, n)
+    return pd.DataFrame({
+        "d": pd.Timestamp("2021-01-01") + pd.to_timedelta(seconds, "s"),
+        "y1": rng.random(n),
+        "y2": rng.integers(0, 10, n),
+        "g": rng.choice(["a", "b"], n),
+    })
+
+
+def _expected(df, y, rule, agg_func):
+    result = getattr(df.set_index("d")[y].resample(rule), agg_func)()
+    if agg_func == "mean":
+        result = result.dropna()
+    else:
+        # 没有数据的时间段不会输出
+        counts = df.set_index("d")[y].resample(rule).count()
+        result = result[counts > 0]
+    return [[ms, v] for ms, v in zip(to_epoch_ms(result.index.to_series()),
+                                     result.tolist())]
+
+
+def _data(chart, i=0):
+    return json.loads(chart.dump_options())["series"][i]["data"]
+
+
+def test_line_resample_defaults_to_mean(ts):
+    data = _data(ts.echart.line("d", "y1", xtype="time", resample="3h"))
+    expected = _expected(ts, "y1", "3h", "mean")
+    assert [ms for ms, _ in data] == [ms for ms, _ in expected]
+    assert np.allclose([v for _, v in data], [v for _, v in expected])
+
+
+def test_empty_buckets_are_skipped(ts):
+    ts = ts[~ts["d"].between("2021-01-02 02:00", "2021-01-02 09:00")]
+    data = _data(ts.echart.line("d", "y1", xtype="time", resample="3h"))
+    assert len(data) == len(_expected(ts, "y1", "3h", "mean")) == 22
+
+
+@pytest.mark.parametrize("method", ["line", "bar"])
+def test_resample_with_agg_func(ts, method):
+    chart = getattr(ts.echart, method)("d", ["y1", "y2"], xtype="time",
+                                       resample="1D", agg_func="sum")
+    for i, y in enumerate(["y1", "y2"]):
+        data = _data(chart, i)
+        expected = _expected(ts, y, "1D", "sum")
+        assert [ms for ms, _ in data] == [ms for ms, _ in expected]
+        assert np.allclose([v for _, v in data], [v for _, v in expected])
+
+
+def test_resample_within_by_groups(ts):
+    page = ts.echart.line("d", "y2", xtype="time", resample="6h",
+                          agg_func="max", by="g")
+    for chart, (_, group) in zip(page._charts, ts.groupby("g")):
+        assert _data(chart) == _expected(group, "y2", "6h", "max")
+
+
+def test_string_dates_are_parsed(ts):
+    strings = ts.assign(d=ts["d"].dt.strftime("%Y-%m-%d %H:%M:%S"))
+    result = _data(strings.echart.line("d", "y1", xtype="time",
+                                       resample="12h"))
+    assert result == _data(ts.echart.line("d", "y1", xtype="time",
+                                          resample="12h"))
+
+
+def test_resample_reduces_the_points(ts):
+    big = pd.concat([ts] * 20, ignore_index=True)
+    data = _data(big.echart.line("d", "y1", xtype="time", resample="1h"))
+    assert len(data) <= 72
@@ -0,0 +1,100 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasecharts.core import stats_tool
+from pandasecharts.core.data_tool import to_category
+from pandasecharts.core.stats_tool import ColumnStats, stats_of
+
+
+def test_column_stats():
+    stats = ColumnStats(pd.Series([3.0, np.nan, 1.0, 2.0, 1.0]))
+    assert (stats.min, stats.max, stats.null_count) == (1.0, 3.0, 1)
+    assert stats.n_unique == 3
+    assert stats.is_monotonic is False
+    assert stats.kind == "value"
+    assert ColumnStats(pd.Series([1, 2, 2])).is_monotonic
+
+
+def test_column_stats_of_strings():
+    stats = ColumnStats(pd.Series(["b", None, "a"]))
+    assert (stats.min, stats.max, stats.null_count) == (None, None, 1)
+    assert stats.kind == "category"
+
+
+def test_n_unique_is_approximate_but_close():
+    series = pd.Series(np.arange(50_000) % 20_000)
+    assert ColumnStats(series).n_unique == pytest.approx(20_000, rel=0.05)
+
+
+def test_stats_are_shared_across_accessors(df):
+    assert df.echart._stats is df.echart._stats
+    stats = df.echart._stats["y1"]
+    assert df.echart._stats["y1"] is stats
+    series = df["y1"]
+    assert stats_of(series) is stats_of(series)
+
+
+def test_inplace_change_invalidates_the_column(df):
+    cache = df.echart._stats
+    y1, y2 = cache["y1"], cache["y2"]
+    assert y1.max < 10
+    df.loc[0, "y1"] = 10
+    assert cache["y1"] is not y1
+    assert cache["y1"].max == 10
+    assert cache["y2"] is y2
+
+
+def test_replaced_column_invalidates_the_column(df):
+    cache = df.echart._stats
+    digest = cache["y2"].digest
+    df["y2"] = df["y2"] * 2
+    assert cache["y2"].digest != digest
+    assert cache["y2"].max == df["y2"].max()
+
+
+def test_series_stats_invalidation():
+    series = pd.Series([1.0, 2.0, 3.0])
+    stats = stats_of(series)
+    assert stats.max == 3.0
+    series[1] = 5.0
+    assert stats_of(series) is not stats
+    assert stats_of(series).max == 5.0
+
+
+def test_stats_are_not_reused_without_copy_on_write(df, monkeypatch):
+    monkeypatch.setattr(stats_tool, "copy_on_write", lambda: False)
+    cache = df.echart._stats
+    assert cache["y1"] is not cache["y1"]
+
+
+def test_visualmap_range_follows_changes(df):
+    df["prov"] = np.where(df["g"] == "g1", "广东", "北京")
+
+    def visualmap(df):
+        chart = df.echart.map("prov", "y2", agg_func="max",
+                              maptype="china", visualmap=True)
+        options = json.loads(chart.dump_options())["visualMap"]
+        options = options[0] if isinstance(options, list) else options
+        return options["min"], options["max"]
+
+    assert visualmap(df) == (df["y2"].min(), df["y2"].max())
+    df.loc[0, "y2"] = 1000
+    assert visualmap(df) == (df["y2"].min(), 1000)
+
+
+def test_to_category_keeps_string_values():
+    series = pd.Series([10, 2, 10, 2, 1, 2, np.nan])
+    result = to_category(series, ColumnStats(series))
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert result.astype(str).tolist() == series.astype(str).tolist()
+    assert list(result.cat.categories) == ["1.0", "10.0", "2.0"]
+
+
+def test_to_category_falls_back_for_distinct_values():
+    series = pd.Series(np.arange(100))
+    result = to_category(series, ColumnStats(series))
+    assert not isinstance(result.dtype, pd.CategoricalDtype)
+    assert result.tolist() == series.astype(str).tolist()
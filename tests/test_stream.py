@@ -0,0 +1,51 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasecharts.core.data_tool import aggregate, aggregate_chunks
+from pandasecharts.stream import StreamEcharts
+
+
+def _chunks(df, size=70):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+@pytest.mark.parametrize("agg_func", ["sum", "count", "mean", "min", "max"])
+def test_aggregate_chunks_matches_aggregate(df, agg_func):
+    expected = aggregate(df, "x", ["y1", "y2"], agg_func, by="g")
+    result = aggregate_chunks(_chunks(df), "x", ["y1", "y2"], agg_func,
+                              by="g")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_stream_chart_matches_in_memory_chart(df):
+    expected = json.loads(df.echart.pie("cat", "y2", agg_func="max")
+                          .dump_options())
+    result = json.loads(StreamEcharts(_chunks(df)).pie("cat", "y2",
+                                                        agg_func="max")
+                        .dump_options())
+    assert result["series"] == expected["series"]
+
+
+def test_stream_visualmap_uses_raw_value_range(df):
+    df = df.assign(prov=np.where(df["g"] == "g1", "广东", "北京"))
+    chart = StreamEcharts(_chunks(df)).map("prov", "y2", agg_func="mean",
+                                           maptype="china", visualmap=True)
+    visualmap = json.loads(chart.dump_options())["visualMap"]
+    visualmap = visualmap[0] if isinstance(visualmap, list) else visualmap
+    assert (visualmap["min"], visualmap["max"]) == (df["y2"].min(),
+                                                    df["y2"].max())
+
+
+def test_stream_iterator_is_consumed_once(df):
+    stream = StreamEcharts(iter(_chunks(df)))
+    stream.pie("cat", "y2")
+    with pytest.raises(RuntimeError):
+        stream.pie("cat", "y2")
+
+
+def test_stream_rejects_unsupported_agg_func(df):
+    with pytest.raises(ValueError):
+        aggregate_chunks(_chunks(df), "x", ["y1"], "median")
@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasecharts.core.data_tool import to_epoch_ms
+
+
+@pytest.fixture
+def ts():
+    return pd.DataFrame({
+        "d": pd.date_range("2021-01-01", periods=4, freq="D"),
+        "y": [1, 2, 3, 4.5],
+    })
+
+
+EPOCH_MS = [1609459200000, 1609545600000, 1609632000000, 1609718400000]
+
+
+def _options(chart):
+    return json.loads(chart.dump_options())
+
+
+def test_to_epoch_ms():
+    dates = pd.Series(pd.to_datetime(["2021-01-01", None, "2021-01-02"]))
+    result = to_epoch_ms(dates)
+    assert result[0] == EPOCH_MS[0] and result[2] == EPOCH_MS[1]
+    assert np.isnan(result[1])
+    assert to_epoch_ms(pd.Series(["2021-01-01"])).tolist() == EPOCH_MS[:1]
+
+
+def test_to_epoch_ms_of_aware_datetimes_is_utc():
+    dates = pd.Series(pd.date_range("2021-01-01 08:00", periods=1,
+                                    tz="Asia/Shanghai"))
+    assert to_epoch_ms(dates).tolist() == EPOCH_MS[:1]
+
+
+@pytest.mark.parametrize("method", ["line", "scatter", "bar"])
+def test_datetime_x_is_sent_as_epoch_ms(ts, method):
+    options = _options(getattr(ts.echart, method)("d", "y", xtype="time"))
+    assert options["xAxis"][0]["type"] == "time"
+    assert not options["xAxis"][0].get("data")
+    assert options["series"][0]["data"] == [
+        [ms, y] for ms, y in zip(EPOCH_MS, ts["y"])]
+
+
+def test_time_type_is_inferred_for_datetimes(ts):
+    with pytest.warns(UserWarning, match="'time' is infered"):
+        options = _options(ts.echart.line("d", "y"))
+    assert options["xAxis"][0]["type"] == "time"
+
+
+def test_reversed_time_bar_swaps_the_pairs(ts):
+    options = _options(ts.echart.bar("d", "y", xtype="time",
+                                     reverse_axis=True))
+    assert options["yAxis"][0]["type"] == "time"
+    assert options["series"][0]["data"] == [
+        [y, ms] for ms, y in zip(EPOCH_MS, ts["y"])]
+
+
+def test_large_time_series_keeps_integer_milliseconds():
+    n = 5000
+    df = pd.DataFrame({"d": pd.date_range("2021-01-01", periods=n,
+                                          freq="min"),
+                       "y": np.random.default_rng(0).random(n)})
+    data = _options(df.echart.line("d", "y", xtype="time"))[
+        "series"][0]["data"]
+    assert len(data) == n
+    assert data[1][0] - data[0][0] == 60_000
+    assert all(isinstance(ms, int) for ms, _ in data[:10])
+    assert [y for _, y in data] == df["y"].tolist()
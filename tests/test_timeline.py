@@ -0,0 +1,100 @@
+import copy
+import json
+
+import numpy as np
+from pyecharts import charts
+
+from pandasecharts.core.timeline_tool import _factor_dicts, factor_timeline
+
+
+def _merge(base, frame, top=True):
+    """merge a frame into baseOption the way ECharts does"""
+    merged = copy.deepcopy(base)
+    for key, value in frame.items():
+        old = merged.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            merged[key] = _merge(old, value, top=False)
+        elif (top and isinstance(value, list) and isinstance(old, list)
+              and len(value) == len(old)):
+            merged[key] = [_merge(o, v, top=False)
+                           if isinstance(o, dict) and isinstance(v, dict)
+                           else v for o, v in zip(old, value)]
+        else:
+            merged[key] = value
+    return merged
+
+
+def _timeline(categories, values):
+    tl = charts.Timeline()
+    for i, (cats, vals) in enumerate(zip(categories, values)):
+        bar = charts.Bar().add_xaxis(cats).add_yaxis("y", vals)
+        tl.add(bar, str(i))
+    return tl
+
+
+def _frames(tl):
+    return json.loads(tl.dump_options())
+
+
+def test_factor_dicts():
+    dicts = [{"a": 1, "b": {"c": 1, "d": i}, "s": [{"e": 0, "f": i}]}
+             for i in range(3)]
+    common, rests = _factor_dicts(dicts, split_lists=True)
+    assert common == {"a": 1, "b": {"c": 1}, "s": [{"e": 0}]}
+    assert rests == [{"b": {"d": i}, "s": [{"f": i}]} for i in range(3)]
+
+
+def test_factored_frames_merge_back_to_the_original():
+    tl = _timeline([["a", "b"], ["a", "b"]], [[1, 2], [3, 4]])
+    before = _frames(tl)["options"]
+    after = _frames(factor_timeline(tl))
+    assert "xAxis" in after["baseOption"]
+    assert all("xAxis" not in frame for frame in after["options"])
+    for original, frame in zip(before, after["options"]):
+        merged = _merge(after["baseOption"], frame)
+        assert {k: merged[k] for k in original} == original
+
+
+def test_different_categories_are_kept_without_an_order():
+    tl = factor_timeline(_timeline([["a", "b"], ["b", "c"]],
+                                   [[1, 2], [3, 4]]))
+    frames = _frames(tl)["options"]
+    assert [f["xAxis"][0]["data"] for f in frames] == [["a", "b"],
+                                                       ["b", "c"]]
+
+
+def test_different_categories_share_an_ordered_axis():
+    tl = factor_timeline(_timeline([["a", "b"], ["b", "c"]],
+                                   [[1, 2], [3, 4]]),
+                         axis_order=["a", "b", "c"])
+    options = _frames(tl)
+    assert options["baseOption"]["xAxis"][0]["data"] == ["a", "b", "c"]
+    assert [f["series"][0]["data"] for f in options["options"]] == [
+        [1, 2, None], [None, 3, 4]]
+
+
+def test_unordered_categories_are_not_merged():
+    tl = factor_timeline(_timeline([["b", "a"], ["b", "c"]],
+                                   [[1, 2], [3, 4]]),
+                         axis_order=["a", "b", "c"])
+    frames = _frames(tl)["options"]
+    assert [f["xAxis"][0]["data"] for f in frames] == [["b", "a"],
+                                                       ["b", "c"]]
+
+
+def test_bar_timeline_shares_the_x_axis(df):
+    df = df[~((df["t"] == 2020) & (df["x"] == 3))]
+    options = json.loads(df.echart.bar("x", "y1", agg_func="sum",
+                                       timeline="t").dump_options())
+    categories = options["baseOption"]["xAxis"][0]["data"]
+    assert sorted(categories) == sorted(str(x) for x in range(12))
+    for frame, (t, group) in zip(options["options"], df.groupby("t")):
+        assert set(frame) == {"series", "title"}
+        sums = group.groupby(group["x"].astype(str))["y1"].sum()
+        expected = [sums.get(c) for c in categories]
+        data = frame["series"][0]["data"]
+        assert [v is None for v in data] == [v is None for v in expected]
+        assert np.allclose([v for v in data if v is not None],
+                           [v for v in expected if v is not None])
+    assert options["options"][1]["series"][0]["data"][
+        categories.index("3")] is None